@@ -118,7 +118,7 @@ class StaticAnalyzer:
             self.define('python', {'type': 'module', 'exports': {'exec': {'type': 'native_function'}}})
         
         for stmt in ast[1]:
-            if stmt[0] == 'func_def':
+            if stmt[0] in ('func_def', 'async_func_def'):
                 name = stmt[1]
                 params = stmt[2]
                 line = stmt[4]
@@ -132,7 +132,7 @@ class StaticAnalyzer:
                 
                 methods = {}
                 for method_node in method_nodes:
-                    if method_node[0] == 'func_def':
+                    if method_node[0] in ('func_def', 'async_func_def'):
                         method_name, method_params = method_node[1], method_node[2]
                         methods[method_name] = {'type': 'function', 'params': len(method_params)}
 
@@ -222,9 +222,9 @@ class StaticAnalyzer:
         
         elif node_type in ('binop', 'logical_op'):
             self.visit_expr(node[2], line); self.visit_expr(node[3], line)
-        elif node_type in ('unary', 'to_int', 'to_str', 'to_float', 'type'):
+        elif node_type in ('unary', 'to_int', 'to_str', 'to_float', 'type', 'await'):
             self.visit_expr(node[1], line)
-        elif node_type == 'list':
+        elif node_type in ('list', 'set'):
             for item in node[1]: self.visit_expr(item, line)
         elif node_type == 'dict':
             for k, v in node[1]: self.visit_expr(k, line); self.visit_expr(v, line)
@@ -248,6 +248,7 @@ class StaticAnalyzer:
     def visit_stmt_while(self, n): self.visit_expr(n[1], n[3]); self.enter_scope(); [self.visit_stmt(s) for s in n[2]]; self.exit_scope()
     def visit_stmt_for(self, n): self.visit_expr(n[2], n[4]); self.enter_scope(); self.define(n[1], {'type': 'variable'}); [self.visit_stmt(s) for s in n[3]]; self.exit_scope()
     def visit_stmt_func_def(self, n): self.enter_scope(); [self.define(p, {'type': 'parameter'}) for p in n[2]]; [self.visit_stmt(s) for s in n[3]]; self.exit_scope()
+    visit_stmt_async_func_def = visit_stmt_func_def
     def visit_stmt_class_def(self, node):
         _, name, parent_name, method_nodes, line = node
 
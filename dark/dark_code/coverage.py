@@ -0,0 +1,167 @@
+import json
+import os
+import sys
+import time
+from dark_code.lexer import lex
+from dark_code.parser import Parser
+
+COVERAGE_DIR_ENV = 'DARK_COVERAGE_DIR'
+COVERAGE_DIR = '.darkcoverage'
+STATEMENT_NODES = {
+    'print', 'println', 'import', 'func_def', 'async_func_def', 'class_def', 'return',
+    'assign', 'member_assign', 'index_assign', 'if', 'while', 'for', 'expr', 'try_except',
+}
+
+
+def executable_lines(ast):
+    """Returns the set of lines that start a statement; method headers are skipped because class_def builds them without running them."""
+    lines = set()
+    stack = [(ast, False)]
+    while stack:
+        node, in_class = stack.pop()
+        if isinstance(node, list):
+            stack.extend((child, in_class) for child in node)
+            continue
+        if not isinstance(node, tuple) or not node:
+            continue
+        kind = node[0]
+        if kind in STATEMENT_NODES and isinstance(node[-1], int) and not in_class:
+            lines.add(node[-1])
+        for child in node[1:]:
+            if isinstance(child, (tuple, list)):
+                stack.append((child, kind == 'class_def'))
+    return lines
+
+
+def _line_ranges(lines):
+    ranges = []
+    for line in sorted(lines):
+        if ranges and ranges[-1][1] == line - 1:
+            ranges[-1][1] = line
+        else:
+            ranges.append([line, line])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+class Coverage:
+    """
+    Сбор покрытия строк через обработчик on_line: для каждого файла хранится карта
+    строк (bytearray, один байт на строку), так что запись попадания - одна операция.
+    Результаты запусков сохраняются фрагментами в каталог данных и объединяются
+    побитовым ИЛИ, поэтому параллельные запуски не мешают друг другу.
+    """
+    def __init__(self):
+        self.bitmaps = {}
+
+    def on_line(self, file_name, line, env):
+        bitmap = self.bitmaps.get(file_name)
+        if bitmap is None or line >= len(bitmap):
+            bitmap = self._grow(file_name, line)
+        bitmap[line] = 1
+
+    def _grow(self, file_name, line):
+        bitmap = self.bitmaps.get(file_name, bytearray())
+        bitmap = bitmap + bytearray(max(line + 1, 2 * len(bitmap)) - len(bitmap))
+        self.bitmaps[file_name] = bitmap
+        return bitmap
+
+    def hooks(self):
+        return {'on_line': self.on_line}
+
+    def masks(self):
+        """Returns {file: int} with bit N set for every executed line N."""
+        masks = {}
+        for file_name, bitmap in list(self.bitmaps.items()):
+            if not os.path.exists(file_name):
+                continue
+            masks[file_name] = int.from_bytes(_pack_bits(bitmap), 'little')
+        return masks
+
+    def save_fragment(self, data_dir):
+        """Writes this run's line bitmaps as a new fragment file in data_dir; returns its path."""
+        os.makedirs(data_dir, exist_ok=True)
+        path = os.path.join(data_dir, f"{os.getpid()}-{time.time_ns()}.json")
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'files': {name: format(mask, 'x') for name, mask in self.masks().items()}}, f)
+        os.replace(temp_path, path)
+        return path
+
+
+def _pack_bits(bitmap):
+    packed = bytearray((len(bitmap) + 7) // 8)
+    for line, hit in enumerate(bitmap):
+        if hit:
+            packed[line >> 3] |= 1 << (line & 7)
+    return bytes(packed)
+
+
+def coverage_dir():
+    return os.environ.get(COVERAGE_DIR_ENV) or COVERAGE_DIR
+
+
+def load_fragments(data_dir):
+    """Merges every fragment in data_dir into {file: set of executed lines}."""
+    merged = {}
+    if not os.path.isdir(data_dir):
+        return {}
+    for entry in sorted(os.listdir(data_dir)):
+        if not entry.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(data_dir, entry), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for file_name, mask in data.get('files', {}).items():
+            merged[file_name] = merged.get(file_name, 0) | int(mask, 16)
+    return {file_name: {line for line in range(mask.bit_length()) if mask >> line & 1} for file_name, mask in merged.items()}
+
+
+def erase(data_dir):
+    if not os.path.isdir(data_dir):
+        return
+    for entry in os.listdir(data_dir):
+        os.remove(os.path.join(data_dir, entry))
+    os.rmdir(data_dir)
+
+
+def analyze(executed):
+    """Returns [(file, executable_lines, executed_lines)] for the files that still exist and parse."""
+    results = []
+    for file_name in sorted(executed):
+        try:
+            with open(file_name, 'r', encoding='utf-8') as f:
+                parser = Parser(lex(f.read()))
+            statements = executable_lines(parser.parse())
+        except (OSError, UnicodeDecodeError):
+            continue
+        if parser.errors:
+            continue
+        results.append((file_name, statements, executed[file_name] & statements))
+    return results
+
+
+def write_lcov(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("TN:\n")
+        for file_name, statements, hit in results:
+            f.write(f"SF:{file_name}\n")
+            for line in sorted(statements):
+                f.write(f"DA:{line},{1 if line in hit else 0}\n")
+            f.write(f"LF:{len(statements)}\nLH:{len(hit)}\nend_of_record\n")
+
+
+def print_summary(results, out=None):
+    out = out or sys.stderr
+    width = max([len(file_name) for file_name, _, _ in results] + [len("Итого")])
+    out.write(f"\n{'Файл':<{width}} {'строк':>7} {'пропущено':>10} {'покрытие':>9}  пропущенные строки\n")
+    total, total_hit = 0, 0
+    for file_name, statements, hit in results:
+        total += len(statements)
+        total_hit += len(hit)
+        percent = len(hit) / len(statements) * 100 if statements else 100.0
+        out.write(f"{file_name:<{width}} {len(statements):>7} {len(statements) - len(hit):>10} {percent:>8.1f}%  {_line_ranges(statements - hit)}\n")
+    percent = total_hit / total * 100 if total else 100.0
+    out.write(f"{'Итого':<{width}} {total:>7} {total - total_hit:>10} {percent:>8.1f}%\n")
+    out.flush()
@@ -70,4 +70,6 @@ class DarkError(Exception):
         return f"{traceback_str}{C_ERROR}{error_type}{C_RESET}: {self.message}\n{loc_info}{code_context}"
 
 class DarkSyntaxError(DarkError): pass
-class DarkRuntimeError(DarkError): pass
\ No newline at end of file
+class DarkRuntimeError(DarkError):
+    # Set by run_stmt once the error is counted in METRICS.errors_raised.
+    counted = False
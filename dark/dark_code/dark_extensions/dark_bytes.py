@@ -0,0 +1,134 @@
+from dark_code.dark_exceptions import DarkRuntimeError
+
+ITER_CHUNK_SIZE = 64 * 1024
+
+
+class DarkBuffer:
+    """
+    Байтовый буфер Dark поверх bytes, bytearray или mmap.
+    Хранит ссылку на источник и границы [start, end), поэтому срезы являются
+    представлениями без копирования данных.
+    """
+    __slots__ = ('source', 'start', 'end')
+
+    def __init__(self, source, start=0, end=None):
+        self.source = source
+        self.start = start
+        self.end = len(source) if end is None else end
+
+    def __len__(self):
+        return self.end - self.start
+
+    def _offset(self, index):
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise TypeError(f"byte indices must be integers, not '{type(index).__name__}'")
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(index)
+        return self.start + index
+
+    def _data(self):
+        # A closed mmap raises a bare ValueError on any access.
+        if getattr(self.source, 'closed', False):
+            raise DarkRuntimeError("буфер закрыт: отображение файла в память уже освобождено")
+        return self.source
+
+    def __getitem__(self, index):
+        return self._data()[self._offset(index)]
+
+    def __setitem__(self, index, value):
+        if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= 255:
+            raise TypeError("byte values must be integers in range 0..255")
+        if isinstance(self.source, bytes):
+            raise TypeError("bytes buffer is read-only")
+        self._data()[self._offset(index)] = value
+
+    def __iter__(self):
+        source = self._data()
+        for offset in range(self.start, self.end, ITER_CHUNK_SIZE):
+            yield from source[offset:min(offset + ITER_CHUNK_SIZE, self.end)]
+
+    def __eq__(self, other):
+        return isinstance(other, DarkBuffer) and len(self) == len(other) and self.tobytes() == other.tobytes()
+
+    def __str__(self):
+        values = list(self._data()[self.start:min(self.end, self.start + 32)])
+        suffix = ", ..." if len(self) > 32 else ""
+        return f"bytes([{', '.join(map(str, values))}{suffix}])"
+
+    def slice(self, start, end):
+        if not isinstance(start, int) or not isinstance(end, int):
+            raise TypeError("bytes.slice() bounds must be integers")
+        bounds = range(self.start, self.end)[start:end]
+        if not bounds:
+            return DarkBuffer(self.source, self.start, self.start)
+        return DarkBuffer(self.source, bounds.start, bounds.stop)
+
+    def find(self, needle, start=0):
+        if isinstance(needle, str):
+            needle = needle.encode('utf-8')
+        elif isinstance(needle, DarkBuffer):
+            needle = needle.tobytes()
+        elif isinstance(needle, int) and not isinstance(needle, bool):
+            needle = bytes([needle])
+        else:
+            raise TypeError("bytes.find() expects a string, bytes or a byte value")
+        if not isinstance(start, int):
+            raise TypeError("bytes.find() start must be an integer")
+        position = self._data().find(needle, self.start + max(start, 0), self.end)
+        return position - self.start if position >= 0 else -1
+
+    def tobytes(self):
+        return bytes(self._data()[self.start:self.end])
+
+    def decode(self, encoding='utf-8'):
+        try:
+            return self.tobytes().decode(encoding, errors='replace')
+        except LookupError:
+            raise DarkRuntimeError(f"неизвестная кодировка: '{encoding}'")
+
+    def close(self):
+        if hasattr(self.source, 'close'):
+            self.source.close()
+
+
+def wrap_bytes(value):
+    """Wraps raw bytes returned by binary file operations into a DarkBuffer."""
+    if isinstance(value, (bytes, bytearray)):
+        return DarkBuffer(value)
+    return value
+
+
+def native_bytes_from_str(args):
+    """Encodes a string into a bytes buffer (utf-8 by default)."""
+    if len(args) not in (1, 2): raise TypeError("bytes.from_str() takes 1 or 2 arguments (string, encoding_optional)")
+    text = args[0]
+    encoding = args[1] if len(args) == 2 else 'utf-8'
+    if not isinstance(text, str) or not isinstance(encoding, str):
+        raise TypeError("Arguments for bytes.from_str() must be strings")
+    try:
+        return DarkBuffer(bytearray(text.encode(encoding)))
+    except (LookupError, UnicodeEncodeError) as e:
+        raise DarkRuntimeError(f"не удалось закодировать строку: {e}")
+
+def native_bytes_from_list(args):
+    """Creates a bytes buffer from a list of integers in range 0..255."""
+    if len(args) != 1: raise TypeError("bytes.from_list() takes 1 argument (list)")
+    try:
+        return DarkBuffer(bytearray(args[0]))
+    except (TypeError, ValueError):
+        raise TypeError("bytes.from_list() expects a list of integers in range 0..255")
+
+def native_bytes_to_str(args):
+    """Decodes a bytes buffer into a string (utf-8 by default)."""
+    if len(args) not in (1, 2): raise TypeError("bytes.to_str() takes 1 or 2 arguments (buffer, encoding_optional)")
+    buffer = args[0]
+    if not isinstance(buffer, DarkBuffer): raise TypeError("First argument to bytes.to_str() must be a bytes buffer")
+    return buffer.decode(args[1] if len(args) == 2 else 'utf-8')
+
+def native_bytes_len(args):
+    """Returns the length of a bytes buffer."""
+    if len(args) != 1: raise TypeError("bytes.len() takes 1 argument (buffer)")
+    if not isinstance(args[0], DarkBuffer): raise TypeError("Argument to bytes.len() must be a bytes buffer")
+    return len(args[0])
@@ -0,0 +1,75 @@
+from dark_code.native_callbacks import with_interpreter
+
+DEBUG_EVENTS = {
+    'call': 'on_call',
+    'return': 'on_return',
+    'line': 'on_line',
+    'exception': 'on_exception',
+    'native_call': 'on_native_call',
+}
+
+
+def _check_callback(fn, func_name):
+    from dark_code.interpreter import Function, BoundMethod
+    if not isinstance(fn, (Function, BoundMethod)):
+        raise TypeError(f"Argument to debug.{func_name}() must be a Dark function")
+    return fn
+
+def _register(interpreter, event, adapter):
+    adapter.from_dark = True
+    interpreter.add_hook(event, adapter)
+    return 0
+
+
+@with_interpreter
+def native_debug_on_call(args, interpreter):
+    """Calls fn(name, args, line) before every Dark function call."""
+    if len(args) != 1: raise TypeError("debug.on_call() takes 1 argument (function)")
+    fn = _check_callback(args[0], 'on_call')
+    return _register(interpreter, 'on_call', lambda func, call_args, line: interpreter.call_value(fn, [func.name, list(call_args), line or 0]))
+
+@with_interpreter
+def native_debug_on_return(args, interpreter):
+    """Calls fn(name, value) after every Dark function returns."""
+    if len(args) != 1: raise TypeError("debug.on_return() takes 1 argument (function)")
+    fn = _check_callback(args[0], 'on_return')
+    return _register(interpreter, 'on_return', lambda func, value: interpreter.call_value(fn, [func.name, value]))
+
+@with_interpreter
+def native_debug_on_line(args, interpreter):
+    """Calls fn(file, line) before every statement."""
+    if len(args) != 1: raise TypeError("debug.on_line() takes 1 argument (function)")
+    fn = _check_callback(args[0], 'on_line')
+    return _register(interpreter, 'on_line', lambda file_name, line, env: interpreter.call_value(fn, [file_name, line]))
+
+@with_interpreter
+def native_debug_on_exception(args, interpreter):
+    """Calls fn(error) once for every runtime error; error has message, file and line."""
+    if len(args) != 1: raise TypeError("debug.on_exception() takes 1 argument (function)")
+    fn = _check_callback(args[0], 'on_exception')
+    return _register(interpreter, 'on_exception', lambda error, file_name, line: interpreter.call_value(
+        fn, [{'message': str(error.message), 'file': file_name, 'line': line}]))
+
+@with_interpreter
+def native_debug_on_native_call(args, interpreter):
+    """Calls fn(module, name, args) before every native function call."""
+    if len(args) != 1: raise TypeError("debug.on_native_call() takes 1 argument (function)")
+    fn = _check_callback(args[0], 'on_native_call')
+    return _register(interpreter, 'on_native_call', lambda func, call_args, line: interpreter.call_value(
+        fn, [*interpreter.native_name(func), list(call_args)]))
+
+@with_interpreter
+def native_debug_clear(args, interpreter):
+    """Removes the hooks registered from Dark, for one event (call, return, line, exception, native_call) or all."""
+    if len(args) > 1: raise TypeError("debug.clear() takes 0 or 1 argument (event_optional)")
+    if args:
+        if args[0] not in DEBUG_EVENTS:
+            raise TypeError(f"Unknown debug event '{args[0]}', expected one of: {', '.join(DEBUG_EVENTS)}")
+        events = [DEBUG_EVENTS[args[0]]]
+    else:
+        events = list(DEBUG_EVENTS.values())
+    for event in events:
+        for callback in interpreter.hooks.callbacks[event]:
+            if getattr(callback, 'from_dark', False):
+                interpreter.remove_hook(event, callback)
+    return 0
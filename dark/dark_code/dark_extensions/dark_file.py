@@ -1,4 +1,23 @@
+import errno
+import io
+import mmap
+import os as python_os
+import sys
 from dark_code.dark_exceptions import DarkRuntimeError
+from dark_code.dark_extensions.dark_bytes import DarkBuffer, wrap_bytes
+from dark_code.dark_extensions.dark_tasks import run_async
+from dark_code.native_callbacks import with_caller
+
+WRITE_LINES_BATCH = 1024
+KERNEL_COPY_CHUNK = 16 * 1024 * 1024
+BUFFERED_COPY_CHUNK = 1024 * 1024
+KERNEL_COPY_FALLBACK_ERRORS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EPERM}
+MMAP_MODES = {
+    'r': ('rb', mmap.ACCESS_READ),
+    'w': ('r+b', mmap.ACCESS_WRITE),
+    'r+': ('r+b', mmap.ACCESS_WRITE),
+    'c': ('rb', mmap.ACCESS_COPY),
+}
 
 
 def native_file_open(args):
@@ -28,13 +47,15 @@ def native_file_read(args):
     if len(args) != 1: raise TypeError("file.read() takes 1 argument (file_object)")
     file_obj = args[0]
     if not hasattr(file_obj, 'read'): raise TypeError("Argument is not a file object")
-    return file_obj.read()
+    return wrap_bytes(file_obj.read())
 
 def native_file_write(args):
     if len(args) != 2: raise TypeError("file.write() takes 2 arguments (file_object, content)")
     file_obj, content = args
     if not hasattr(file_obj, 'write'): raise TypeError("First argument is not a file object")
-    if not isinstance(content, str): raise TypeError("Content to write must be a string")
+    if isinstance(content, DarkBuffer):
+        content = content.tobytes()
+    elif not isinstance(content, str): raise TypeError("Content to write must be a string or bytes")
     file_obj.write(content)
     return None
 
@@ -49,13 +70,13 @@ def native_file_readline(args):
     if len(args) != 1: raise TypeError("file.readline() takes 1 argument (file_object)")
     file_obj = args[0]
     if not hasattr(file_obj, 'readline'): raise TypeError("Argument is not a file object")
-    return file_obj.readline()
+    return wrap_bytes(file_obj.readline())
 
 def native_file_readlines(args):
     if len(args) != 1: raise TypeError("file.readlines() takes 1 argument (file_object)")
     file_obj = args[0]
     if not hasattr(file_obj, 'readlines'): raise TypeError("Argument is not a file object")
-    return file_obj.readlines()
+    return [wrap_bytes(line) for line in file_obj.readlines()]
 
 def native_file_seek(args):
     if len(args) != 2: raise TypeError("file.seek() takes 2 arguments (file_object, offset)")
@@ -63,4 +84,192 @@ def native_file_seek(args):
     if not hasattr(file_obj, 'seek'): raise TypeError("First argument is not a file object")
     if not isinstance(offset, int): raise TypeError("Offset must be an integer")
     file_obj.seek(offset)
-    return None
\ No newline at end of file
+    return None
+
+def native_file_read_chunk(args):
+    if len(args) != 2: raise TypeError("file.read_chunk() takes 2 arguments (file_object, size)")
+    file_obj, size = args
+    if not hasattr(file_obj, 'read'): raise TypeError("First argument is not a file object")
+    if not isinstance(size, int) or size <= 0: raise TypeError("Chunk size must be a positive integer")
+    return wrap_bytes(file_obj.read(size))
+
+def _iter_chunks(file_obj, size):
+    while True:
+        chunk = file_obj.read(size)
+        if not chunk:
+            return
+        yield wrap_bytes(chunk)
+
+def iter_lines(file_obj):
+    """Iterates the lines of a file object; lines of binary files are wrapped into bytes buffers."""
+    binary = isinstance(file_obj, (io.BufferedIOBase, io.RawIOBase))
+    try:
+        for line in file_obj:
+            yield wrap_bytes(line) if binary else line
+    except ValueError:
+        raise DarkRuntimeError("чтение из закрытого файла")
+    except OSError as e:
+        raise DarkRuntimeError(f"ошибка чтения файла: {e}")
+
+def native_file_chunks(args):
+    if len(args) != 2: raise TypeError("file.chunks() takes 2 arguments (file_object, size)")
+    file_obj, size = args
+    if not hasattr(file_obj, 'read'): raise TypeError("First argument is not a file object")
+    if not isinstance(size, int) or size <= 0: raise TypeError("Chunk size must be a positive integer")
+    return _iter_chunks(file_obj, size)
+
+def native_file_write_lines(args):
+    if len(args) != 2: raise TypeError("file.write_lines() takes 2 arguments (file_object, lines)")
+    file_obj, lines = args
+    if not hasattr(file_obj, 'writelines'): raise TypeError("First argument is not a file object")
+    try:
+        items = iter(lines)
+    except TypeError:
+        raise TypeError("Second argument to file.write_lines() must be a list or another iterable")
+
+    batch = []
+    written = 0
+    for line in items:
+        if not isinstance(line, str): raise TypeError("Lines to write must be strings")
+        batch.append(line if line.endswith('\n') else line + '\n')
+        if len(batch) >= WRITE_LINES_BATCH:
+            file_obj.writelines(batch)
+            written += len(batch)
+            batch.clear()
+    file_obj.writelines(batch)
+    return written + len(batch)
+
+
+def native_file_mmap(args):
+    if len(args) not in (1, 2): raise TypeError("file.mmap() takes 1 or 2 arguments (file_name, mode_optional)")
+    file_name = args[0]
+    mode = args[1] if len(args) == 2 else 'r'
+    if mode not in MMAP_MODES: raise TypeError(f"Unsupported mmap mode '{mode}', expected one of: {', '.join(MMAP_MODES)}")
+    open_mode, access = MMAP_MODES[mode]
+    try:
+        with open(file_name, open_mode) as file_obj:
+            if python_os.fstat(file_obj.fileno()).st_size == 0:
+                return DarkBuffer(b"")
+            return DarkBuffer(mmap.mmap(file_obj.fileno(), 0, access=access))
+    except FileNotFoundError:
+        raise DarkRuntimeError(f"файл не найден: '{file_name}'")
+    except PermissionError:
+        raise DarkRuntimeError(f"нет прав для открытия файла: '{file_name}'")
+    except (OSError, ValueError) as e:
+        raise DarkRuntimeError(f"не удалось отобразить файл '{file_name}' в память: {e}")
+
+
+def _copy_fd(src_file, dst_fd, size, on_progress):
+    """
+    Copies size bytes from the start of the binary file src_file to dst_fd.
+    Uses copy_file_range or sendfile when the kernel supports them and falls
+    back to a large buffered copy otherwise.
+    """
+    src_fd = src_file.fileno()
+    copied = 0
+    if hasattr(python_os, 'copy_file_range'):
+        try:
+            while copied < size:
+                sent = python_os.copy_file_range(src_fd, dst_fd, min(KERNEL_COPY_CHUNK, size - copied))
+                if sent == 0:
+                    return copied
+                copied += sent
+                on_progress(sent)
+            return copied
+        except OSError as e:
+            if copied or e.errno not in KERNEL_COPY_FALLBACK_ERRORS:
+                raise
+
+    if hasattr(python_os, 'sendfile') and sys.platform.startswith('linux'):
+        try:
+            while copied < size:
+                sent = python_os.sendfile(dst_fd, src_fd, copied, min(KERNEL_COPY_CHUNK, size - copied))
+                if sent == 0:
+                    return copied
+                copied += sent
+                on_progress(sent)
+            return copied
+        except OSError as e:
+            if copied or e.errno not in KERNEL_COPY_FALLBACK_ERRORS:
+                raise
+
+    buffer = bytearray(BUFFERED_COPY_CHUNK)
+    view = memoryview(buffer)
+    while True:
+        read = src_file.readinto(buffer)
+        if not read:
+            return copied
+        written = 0
+        while written < read:
+            written += python_os.write(dst_fd, view[written:read])
+        copied += read
+        on_progress(read)
+
+
+def _append_files(sources, dst_name, truncate, progress, call_function, func_name):
+    for src_name in sources:
+        if not isinstance(src_name, str): raise TypeError(f"File names for file.{func_name}() must be strings")
+    if not isinstance(dst_name, str): raise TypeError(f"Destination for file.{func_name}() must be a string")
+
+    total = 0
+    for src_name in sources:
+        try:
+            if python_os.path.exists(dst_name) and python_os.path.samefile(src_name, dst_name):
+                raise DarkRuntimeError(f"исходный и целевой файл совпадают: '{src_name}'")
+            total += python_os.path.getsize(src_name)
+        except FileNotFoundError:
+            raise DarkRuntimeError(f"файл не найден: '{src_name}'")
+
+    done = 0
+    def on_progress(count):
+        nonlocal done
+        done += count
+        if progress is not None:
+            call_function(progress, [done, total])
+
+    flags = python_os.O_WRONLY | python_os.O_CREAT | getattr(python_os, 'O_BINARY', 0)
+    if truncate:
+        flags |= python_os.O_TRUNC
+    try:
+        dst_fd = python_os.open(dst_name, flags, 0o666)
+        try:
+            python_os.lseek(dst_fd, 0, python_os.SEEK_END)
+            for src_name in sources:
+                with open(src_name, 'rb') as src_file:
+                    _copy_fd(src_file, dst_fd, python_os.fstat(src_file.fileno()).st_size, on_progress)
+        finally:
+            python_os.close(dst_fd)
+    except PermissionError as e:
+        raise DarkRuntimeError(f"нет прав для доступа к файлу: '{e.filename}'")
+    except OSError as e:
+        raise DarkRuntimeError(f"ошибка при копировании в файл '{dst_name}': {e}")
+    return done
+
+@with_caller
+def native_file_copy(args, call_function):
+    if len(args) not in (2, 3): raise TypeError("file.copy() takes 2 or 3 arguments (source, destination, progress_function_optional)")
+    progress = args[2] if len(args) == 3 else None
+    return _append_files([args[0]], args[1], True, progress, call_function, 'copy')
+
+@with_caller
+def native_file_append_file(args, call_function):
+    if len(args) not in (2, 3): raise TypeError("file.append_file() takes 2 or 3 arguments (source, destination, progress_function_optional)")
+    progress = args[2] if len(args) == 3 else None
+    return _append_files([args[0]], args[1], False, progress, call_function, 'append_file')
+
+@with_caller
+def native_file_concat(args, call_function):
+    if len(args) not in (2, 3): raise TypeError("file.concat() takes 2 or 3 arguments (sources_list, destination, progress_function_optional)")
+    sources = args[0]
+    if not isinstance(sources, list): raise TypeError("First argument to file.concat() must be a list of file names")
+    progress = args[2] if len(args) == 3 else None
+    return _append_files(sources, args[1], True, progress, call_function, 'concat')
+
+
+def native_file_read_async(args):
+    """Like file.read(), but returns an awaitable so other tasks run while the file is read."""
+    return run_async(native_file_read, args)
+
+def native_file_write_async(args):
+    """Like file.write(), but returns an awaitable so other tasks run while the data is written."""
+    return run_async(native_file_write, args)
@@ -1,74 +1,682 @@
-from urllib import request, error
+import codecs
+import http.client
+import os as python_os
+import ssl
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib import request
+from urllib.parse import urlsplit, urljoin
+from dark_code.dark_exceptions import DarkRuntimeError
+from dark_code.dark_extensions.dark_bytes import DarkBuffer
+from dark_code.dark_extensions.dark_http_cache import CACHE, CACHE_DEFAULTS, CacheEntry, bypasses_cache, is_cacheable
+from dark_code.dark_extensions.dark_tasks import run_async
+from dark_code.dark_extensions.dark_http_server import DarkServer, PooledHTTPServer, ServerStats, make_handler_class
+from dark_code.native_callbacks import with_caller, with_interpreter
 
+SERVE_DEFAULT_WORKERS = 8
+HTTP_CONFIG = {
+    'timeout': 10,
+    'pool_size': 8,
+    'max_redirects': 5,
+}
+DEFAULT_HEADERS = {
+    'User-Agent': 'Dark-Lang',
+    'Accept': '*/*',
+    'Accept-Encoding': 'gzip, deflate',
+}
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_OPTION_KEYS = {'mode', 'chunk_size', 'headers'}
+NETWORK_ERRORS = (http.client.HTTPException, OSError, ValueError, zlib.error)
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+REQUEST_DICT_KEYS = {'method', 'url', 'data', 'headers'}
+DECODED_ENCODINGS = {'gzip', 'x-gzip', 'deflate'}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'TRACE', 'PUT', 'DELETE'}
+# Errors of a pooled connection the server has already closed; timeouts are deliberately not included.
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
 
-def native_http_get(args):
-    """Performs an HTTP GET request and returns a dictionary with status_code, headers, and body."""
-    if len(args) != 1:
-        raise TypeError("http.get() takes exactly 1 argument (url)")
-    
-    url = args[0]
+
+def _normalize_encoding(content_encoding):
+    return (content_encoding or '').strip().lower()
+
+class BodyDecoder:
+    """Incrementally decodes a response body according to its Content-Encoding (gzip or deflate)."""
+    def __init__(self, content_encoding):
+        content_encoding = _normalize_encoding(content_encoding)
+        self.raw_deflate_fallback = False
+        if content_encoding in ('gzip', 'x-gzip'):
+            self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif content_encoding == 'deflate':
+            self.decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+            self.raw_deflate_fallback = True
+        else:
+            self.decompressor = None
+
+    def feed(self, data):
+        if self.decompressor is None:
+            return data
+        try:
+            return self.decompressor.decompress(data)
+        except zlib.error:
+            if not self.raw_deflate_fallback:
+                raise
+            self.raw_deflate_fallback = False
+            self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self.decompressor.decompress(data)
+        finally:
+            self.raw_deflate_fallback = False
+
+    def flush(self):
+        if self.decompressor is None:
+            return b""
+        return self.decompressor.flush()
+
+
+class ConnectionPool:
+    """
+    Пул keep-alive соединений http.client для каждого хоста.
+    Соединение выдаётся одному запросу за раз и возвращается в пул после
+    полного чтения ответа, если сервер не закрыл его.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle = {}
+        self.ssl_context = None
+
+    def _new_connection(self, key):
+        scheme, host, port, proxy = key
+        timeout = HTTP_CONFIG['timeout']
+        if scheme == 'https':
+            if self.ssl_context is None:
+                self.ssl_context = ssl.create_default_context()
+            if proxy:
+                conn = http.client.HTTPSConnection(proxy[0], proxy[1], timeout=timeout, context=self.ssl_context)
+                conn.set_tunnel(host, port)
+                return conn
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self.ssl_context)
+        if proxy:
+            return http.client.HTTPConnection(proxy[0], proxy[1], timeout=timeout)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def acquire(self, key):
+        """Returns (connection, reused) for the given (scheme, host, port, proxy) key."""
+        with self.lock:
+            idle = self.idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self._new_connection(key), False
+        conn.timeout = HTTP_CONFIG['timeout']
+        if conn.sock is not None:
+            conn.sock.settimeout(conn.timeout)
+        return conn, True
+
+    def release(self, key, conn):
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            if len(idle) < HTTP_CONFIG['pool_size']:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def clear(self):
+        with self.lock:
+            idle_lists = list(self.idle.values())
+            self.idle.clear()
+        for idle in idle_lists:
+            for conn in idle:
+                conn.close()
+
+    def idle_count(self):
+        with self.lock:
+            return sum(len(idle) for idle in self.idle.values())
+
+
+POOL = ConnectionPool()
+
+
+def _proxy_for(scheme, host):
+    proxies = request.getproxies()
+    proxy_url = proxies.get(scheme)
+    if not proxy_url or request.proxy_bypass(host):
+        return None
+    parts = urlsplit(proxy_url if '://' in proxy_url else 'http://' + proxy_url)
+    return (parts.hostname, parts.port or 80)
+
+def _error_response(message):
+    return {
+        "status_code": -1,
+        "headers": {},
+        "body": message
+    }
+
+def _open(method, url, body, headers):
+    """
+    Sends one request over a pooled connection and returns (response, release)
+    with the body still unread. release(reusable) must be called once the body
+    has been consumed or abandoned.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError(f"unsupported URL: {url}")
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    proxy = _proxy_for(parts.scheme, parts.hostname)
+    key = (parts.scheme, parts.hostname, port, proxy)
+
+    target = parts.path or '/'
+    if parts.query:
+        target += '?' + parts.query
+    if proxy and parts.scheme == 'http':
+        target = url
+
+    request_headers = dict(DEFAULT_HEADERS)
+    request_headers.update(headers)
+
+    while True:
+        conn, reused = POOL.acquire(key)
+        sent = False
+        try:
+            conn.request(method, target, body=body, headers=request_headers)
+            sent = True
+            response = conn.getresponse()
+        except STALE_CONNECTION_ERRORS:
+            conn.close()
+            # A stale pooled connection is retried on a fresh one only if the server
+            # cannot have processed the request: it was never fully sent, or repeating it is harmless.
+            if reused and (not sent or method in IDEMPOTENT_METHODS):
+                continue
+            raise
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            raise
+
+        def release(reusable=True, conn=conn, response=response):
+            if reusable and response.isclosed() and not response.will_close:
+                POOL.release(key, conn)
+            else:
+                conn.close()
+        return response, release
+
+def _read_body(response, release):
+    """Reads and decodes the whole body, then hands the connection back to the pool."""
+    try:
+        raw = response.read()
+    except (http.client.HTTPException, OSError):
+        release(False)
+        raise
+    release()
+    decoder = BodyDecoder(response.getheader('Content-Encoding'))
+    return decoder.feed(raw) + decoder.flush()
+
+def _iter_body(response, release, chunk_size):
+    """Yields decoded body chunks; the connection returns to the pool only if the body was fully read."""
+    decoder = BodyDecoder(response.getheader('Content-Encoding'))
+    complete = False
+    try:
+        while True:
+            raw = response.read(chunk_size)
+            if not raw:
+                break
+            data = decoder.feed(raw)
+            if data:
+                yield data
+        tail = decoder.flush()
+        if tail:
+            yield tail
+        complete = True
+    finally:
+        release(complete)
+
+def _iter_lines(chunks):
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line + '\n'
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+def open_request(method, url, body=None, headers=None):
+    """Opens a request following redirects and returns (response, release) for the final response."""
+    headers = dict(headers or {})
+    redirects = 0
+    while True:
+        response, release = _open(method, url, body, headers)
+        location = response.getheader('Location')
+        if response.status not in REDIRECT_CODES or not location or redirects >= HTTP_CONFIG['max_redirects']:
+            return response, release
+        redirects += 1
+        _read_body(response, release)
+        url = urljoin(url, location)
+        if response.status == 303 or (response.status in (301, 302) and method == 'POST'):
+            method, body = 'GET', None
+            headers = {k: v for k, v in headers.items() if k.lower() not in ('content-type', 'content-length')}
+
+def http_request(method, url, body=None, headers=None):
+    """Performs a request following redirects and returns (response, decoded_body)."""
+    response, release = open_request(method, url, body, headers)
+    return response, _read_body(response, release)
+
+def _response_headers(response, size):
+    """
+    Returns the response headers as a dictionary. When the body was transparently decompressed,
+    Content-Encoding is dropped and Content-Length is set to the size of the decoded body.
+    """
+    headers = {key: value for key, value in response.getheaders()}
+    if _normalize_encoding(response.getheader('Content-Encoding')) in DECODED_ENCODINGS:
+        headers = {key: value for key, value in headers.items() if key.lower() not in ('content-encoding', 'content-length')}
+        headers['Content-Length'] = str(size)
+    return headers
+
+def _response_dict(response, data):
+    return {
+        "status_code": response.status,
+        "headers": _response_headers(response, len(data)),
+        "body": data.decode('utf-8', errors='ignore')
+    }
+
+def _encode_body(data, func_name):
+    if data is None:
+        return None
+    if isinstance(data, DarkBuffer):
+        return data.tobytes()
+    if not isinstance(data, str):
+        raise TypeError(f"Data for http.{func_name}() must be a string")
+    return data.encode('utf-8')
+
+def _check_headers(headers, func_name):
+    if headers is None:
+        return {}
+    if not isinstance(headers, dict):
+        raise TypeError(f"Headers for http.{func_name}() must be a dictionary")
+    return {str(k): str(v) for k, v in headers.items()}
+
+def _cached_response(entry):
+    return {
+        "status_code": entry.status,
+        "headers": dict(entry.headers),
+        "body": entry.body.decode('utf-8', errors='ignore')
+    }
+
+def _cached_get(url, headers):
+    """
+    GET through the response cache: fresh entries are served without a request,
+    stale ones are revalidated with If-None-Match / If-Modified-Since.
+    Entries are keyed by the URL and the request headers named in the Vary header.
+    """
+    entry = CACHE.lookup(url, headers)
+    if entry is not None and entry.is_fresh():
+        CACHE.count('hits')
+        return _cached_response(entry)
+    request_headers = dict(headers)
+    if entry is not None:
+        request_headers.update(entry.validators())
+    response, raw = http_request('GET', url, None, request_headers)
+    if entry is not None and response.status == 304:
+        entry.refresh({key: value for key, value in response.getheaders()})
+        CACHE.store(entry, 'revalidated')
+        return _cached_response(entry)
+    CACHE.count('misses')
+    result = _response_dict(response, raw)
+    if is_cacheable(response.status, result['headers']):
+        CACHE.store(CacheEntry(url, response.status, result['headers'], raw, headers))
+    return result
+
+def _perform(method, url, data, headers, func_name):
     if not isinstance(url, str):
-        raise TypeError("Argument to http.get() must be a string")
+        raise TypeError(f"URL for http.{func_name}() must be a string")
+    body = _encode_body(data, func_name)
+    headers = _check_headers(headers, func_name)
+    try:
+        if method == 'GET' and CACHE.enabled and not bypasses_cache(headers):
+            return _cached_get(url, headers)
+        response, raw = http_request(method, url, body, headers)
+    except NETWORK_ERRORS as e:
+        return _error_response(str(e))
+    return _response_dict(response, raw)
 
+def _batch_request(spec, index):
+    """Performs one request of a batch and tags the result with index, url and error."""
+    method, url, data, headers = spec
     try:
-        with request.urlopen(url, timeout=10) as response:
-            headers = {key: value for key, value in response.getheaders()}
-            return {
-                "status_code": response.status,
-                "headers": headers,
-                "body": response.read().decode('utf-8', errors='ignore')
-            }
-    except error.HTTPError as e:
-        headers = {key: value for key, value in e.headers.items()}
-        return {
-            "status_code": e.code,
-            "headers": headers,
-            "body": e.read().decode('utf-8', errors='ignore')
-        }
-    except error.URLError as e:
-        return {
-            "status_code": -1, 
-            "headers": {},
-            "body": str(e.reason)
-        }
-    
+        result = _perform(method, url, data, headers, 'request_many')
+    except TypeError as e:
+        result = _error_response(str(e))
+    result['index'] = index
+    result['url'] = url
+    result['error'] = result['body'] if result['status_code'] == -1 else ""
+    return result
+
+def _request_spec(item, func_name):
+    if isinstance(item, str):
+        return ('GET', item, None, None)
+    if not isinstance(item, dict) or 'url' not in item:
+        raise TypeError(f"Each request for http.{func_name}() must be a URL string or a dictionary with 'url'")
+    unknown = set(item) - REQUEST_DICT_KEYS
+    if unknown:
+        raise TypeError(f"Unknown request keys for http.{func_name}(): {', '.join(sorted(map(str, unknown)))}")
+    method = item.get('method', 'GET')
+    if not isinstance(method, str) or not method:
+        raise TypeError(f"Request 'method' for http.{func_name}() must be a non-empty string")
+    if not isinstance(item['url'], str):
+        raise TypeError(f"Request 'url' for http.{func_name}() must be a string")
+    _encode_body(item.get('data'), func_name)
+    _check_headers(item.get('headers'), func_name)
+    return (method.upper(), item['url'], item.get('data'), item.get('headers'))
+
+def _check_concurrency(value, func_name):
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise TypeError(f"max_concurrency for http.{func_name}() must be a positive integer")
+    return value
+
+def _iter_batch(specs, max_concurrency):
+    """Yields results of a request batch in completion order."""
+    if not specs:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(specs))) as pool:
+        futures = [pool.submit(_batch_request, spec, index) for index, spec in enumerate(specs)]
+        for future in as_completed(futures):
+            yield future.result()
+
+def _run_batch(specs, max_concurrency, callback, call_function):
+    results = [None] * len(specs)
+    for result in _iter_batch(specs, max_concurrency):
+        results[result['index']] = result
+        if callback is not None:
+            call_function(callback, [result])
+    return results
+
+
+def native_http_get(args):
+    """Performs an HTTP GET request and returns a dictionary with status_code, headers, and body."""
+    if len(args) not in [1, 2]:
+        raise TypeError("http.get() takes 1 or 2 arguments (url, headers_dict_optional)")
+    return _perform('GET', args[0], None, args[1] if len(args) == 2 else None, 'get')
+
 def native_http_post(args):
     """Performs an HTTP POST request and returns a dictionary with status_code, headers, and body."""
     if len(args) not in [2, 3]:
         raise TypeError("http.post() takes 2 or 3 arguments (url, data, headers_dict_optional)")
-    
-    url = args[0]
-    data = args[1]
-    headers = {}
-    if len(args) == 3:
-        if not isinstance(args[2], dict):
-            raise TypeError("Optional third argument to http.post() must be a dictionary of headers")
-        headers = args[2]
+    return _perform('POST', args[0], args[1], args[2] if len(args) == 3 else None, 'post')
+
+def native_http_put(args):
+    """Performs an HTTP PUT request and returns a dictionary with status_code, headers, and body."""
+    if len(args) not in [2, 3]:
+        raise TypeError("http.put() takes 2 or 3 arguments (url, data, headers_dict_optional)")
+    return _perform('PUT', args[0], args[1], args[2] if len(args) == 3 else None, 'put')
+
+def native_http_delete(args):
+    """Performs an HTTP DELETE request and returns a dictionary with status_code, headers, and body."""
+    if len(args) not in [1, 2]:
+        raise TypeError("http.delete() takes 1 or 2 arguments (url, headers_dict_optional)")
+    return _perform('DELETE', args[0], None, args[1] if len(args) == 2 else None, 'delete')
+
+def native_http_request(args):
+    """Performs an HTTP request with an arbitrary method."""
+    if len(args) not in [2, 3, 4]:
+        raise TypeError("http.request() takes 2 to 4 arguments (method, url, data_optional, headers_dict_optional)")
+    method = args[0]
+    if not isinstance(method, str) or not method:
+        raise TypeError("First argument to http.request() (method) must be a non-empty string")
+    data = args[2] if len(args) >= 3 else None
+    return _perform(method.upper(), args[1], data, args[3] if len(args) == 4 else None, 'request')
+
+def native_http_configure(args):
+    """Updates timeout, pool_size and max_redirects; returns the current configuration."""
+    if len(args) > 1:
+        raise TypeError("http.configure() takes 0 or 1 argument (options_dict_optional)")
+    if args:
+        options = args[0]
+        if not isinstance(options, dict):
+            raise TypeError("Argument to http.configure() must be a dictionary")
+        for key, value in options.items():
+            if key not in HTTP_CONFIG:
+                raise TypeError(f"Unknown http option '{key}', expected one of: {', '.join(HTTP_CONFIG)}")
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise TypeError(f"http option '{key}' must be a non-negative number")
+            HTTP_CONFIG[key] = int(value) if key != 'timeout' else value
+    return dict(HTTP_CONFIG)
+
+def native_http_close(args):
+    """Closes all idle pooled connections."""
+    if args:
+        raise TypeError("http.close() takes no arguments")
+    POOL.clear()
+    return None
+
+def native_http_cache_enable(args):
+    """Enables the GET response cache (max_entries, max_bytes, dir, disk_max_bytes); returns its settings."""
+    if len(args) > 1:
+        raise TypeError("http.cache_enable() takes 0 or 1 argument (options_dict_optional)")
+    options = args[0] if args else {}
+    if not isinstance(options, dict):
+        raise TypeError("Argument to http.cache_enable() must be a dictionary")
+    config = {}
+    for key, value in options.items():
+        if key not in CACHE_DEFAULTS:
+            raise TypeError(f"Unknown cache option '{key}', expected one of: {', '.join(CACHE_DEFAULTS)}")
+        if key == 'dir':
+            if value is not None and not isinstance(value, str):
+                raise TypeError("Cache option 'dir' must be a path string")
+        elif isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise TypeError(f"Cache option '{key}' must be a non-negative integer")
+        config[key] = value
+    try:
+        CACHE.enable(config)
+    except OSError as e:
+        raise DarkRuntimeError(f"не удалось создать каталог кэша: {e}")
+    return dict(CACHE.config)
+
+def native_http_cache_disable(args):
+    """Disables the response cache and drops its in-memory entries; the disk store is kept."""
+    if args:
+        raise TypeError("http.cache_disable() takes no arguments")
+    CACHE.disable()
+    return None
+
+def native_http_cache_clear(args):
+    """Removes all cached responses from memory and disk and resets the statistics."""
+    if args:
+        raise TypeError("http.cache_clear() takes no arguments")
+    CACHE.clear()
+    CACHE.reset_stats()
+    return None
+
+def native_http_cache_stats(args):
+    """Returns cache statistics: hits, misses, revalidated, stores, evictions, disk_hits, entries, bytes."""
+    if args:
+        raise TypeError("http.cache_stats() takes no arguments")
+    return CACHE.snapshot()
+
+
+@with_caller
+def native_http_get_many(args, call_function):
+    """Fetches many URLs concurrently; results keep input order, the optional callback sees them as they complete."""
+    if len(args) not in [2, 3]:
+        raise TypeError("http.get_many() takes 2 or 3 arguments (urls_list, max_concurrency, callback_optional)")
+    urls = args[0]
+    if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+        raise TypeError("First argument to http.get_many() must be a list of URL strings")
+    max_concurrency = _check_concurrency(args[1], 'get_many')
+    callback = args[2] if len(args) == 3 else None
+    return _run_batch([('GET', url, None, None) for url in urls], max_concurrency, callback, call_function)
+
+@with_caller
+def native_http_request_many(args, call_function):
+    """Performs a list of request dictionaries (method, url, data, headers) concurrently."""
+    if len(args) not in [1, 2, 3]:
+        raise TypeError("http.request_many() takes 1 to 3 arguments (requests_list, max_concurrency_optional, callback_optional)")
+    items = args[0]
+    if not isinstance(items, list):
+        raise TypeError("First argument to http.request_many() must be a list of requests")
+    specs = [_request_spec(item, 'request_many') for item in items]
+    max_concurrency = _check_concurrency(args[1], 'request_many') if len(args) >= 2 else HTTP_CONFIG['pool_size']
+    callback = args[2] if len(args) == 3 else None
+    return _run_batch(specs, max_concurrency, callback, call_function)
+
+def native_http_iter_many(args):
+    """Returns an iterator over results of concurrent requests in completion order, usable in for."""
+    if len(args) not in [1, 2]:
+        raise TypeError("http.iter_many() takes 1 or 2 arguments (requests_list, max_concurrency_optional)")
+    items = args[0]
+    if not isinstance(items, list):
+        raise TypeError("First argument to http.iter_many() must be a list of URLs or requests")
+    specs = [_request_spec(item, 'iter_many') for item in items]
+    max_concurrency = _check_concurrency(args[1], 'iter_many') if len(args) == 2 else HTTP_CONFIG['pool_size']
+    return _iter_batch(specs, max_concurrency)
+
+
+def native_http_download(args):
+    """Streams a response body to a file in chunks, decoding gzip/deflate on the fly."""
+    if len(args) not in [2, 3]:
+        raise TypeError("http.download() takes 2 or 3 arguments (url, path, headers_dict_optional)")
+    url, path = args[0], args[1]
+    if not isinstance(url, str) or not isinstance(path, str):
+        raise TypeError("URL and path for http.download() must be strings")
+    headers = _check_headers(args[2] if len(args) == 3 else None, 'download')
 
+    part_path = path + '.part'
+    size = 0
+    try:
+        with open(part_path, 'wb') as file_obj:
+            response, release = open_request('GET', url, None, headers)
+            if response.status >= 400:
+                body = _read_body(response, release)
+                result = _response_dict(response, body)
+                result.update({"path": path, "size": 0, "error": result.pop("body")})
+                file_obj.close()
+                python_os.remove(part_path)
+                return result
+            for chunk in _iter_body(response, release, STREAM_CHUNK_SIZE):
+                file_obj.write(chunk)
+                size += len(chunk)
+        python_os.replace(part_path, path)
+    except NETWORK_ERRORS as e:
+        if python_os.path.exists(part_path):
+            python_os.remove(part_path)
+        return {"status_code": -1, "headers": {}, "path": path, "size": 0, "error": str(e)}
+    return {
+        "status_code": response.status,
+        "headers": _response_headers(response, size),
+        "path": path,
+        "size": size,
+        "error": ""
+    }
+
+def native_http_stream(args):
+    """Opens a GET request and returns a lazy iterator over body chunks (bytes) or text lines."""
+    if len(args) not in [1, 2]:
+        raise TypeError("http.stream() takes 1 or 2 arguments (url, options_dict_optional)")
+    url = args[0]
     if not isinstance(url, str):
-        raise TypeError("First argument to http.post() (url) must be a string")
-    if not isinstance(data, str):
-        raise TypeError("Second argument to http.post() (data) must be a string")
+        raise TypeError("URL for http.stream() must be a string")
+    options = args[1] if len(args) == 2 else {}
+    if not isinstance(options, dict):
+        raise TypeError("Options for http.stream() must be a dictionary")
+    unknown = set(options) - STREAM_OPTION_KEYS
+    if unknown:
+        raise TypeError(f"Unknown options for http.stream(): {', '.join(sorted(map(str, unknown)))}")
+    mode = options.get('mode', 'chunks')
+    if mode not in ('chunks', 'lines'):
+        raise TypeError("Option 'mode' for http.stream() must be \"chunks\" or \"lines\"")
+    chunk_size = options.get('chunk_size', STREAM_CHUNK_SIZE)
+    if isinstance(chunk_size, bool) or not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise TypeError("Option 'chunk_size' for http.stream() must be a positive integer")
+    headers = _check_headers(options.get('headers'), 'stream')
 
     try:
-        req = request.Request(url, data=data.encode('utf-8'), headers=headers, method='POST')
-        with request.urlopen(req, timeout=10) as response:
-            response_headers = {key: value for key, value in response.getheaders()}
-            return {
-                "status_code": response.status,
-                "headers": response_headers,
-                "body": response.read().decode('utf-8', errors='ignore')
-            }
-    except error.HTTPError as e:
-        headers = {key: value for key, value in e.headers.items()}
-        return {
-            "status_code": e.code,
-            "headers": headers,
-            "body": e.read().decode('utf-8', errors='ignore')
-        }
-    except error.URLError as e:
-        return {
-            "status_code": -1, 
-            "headers": {},
-            "body": str(e.reason)
-        }
\ No newline at end of file
+        response, release = open_request('GET', url, None, headers)
+        if response.status >= 400:
+            body = _read_body(response, release)
+            raise DarkRuntimeError(f"HTTP {response.status} для '{url}': {body.decode('utf-8', errors='ignore')[:200]}")
+    except NETWORK_ERRORS as e:
+        raise DarkRuntimeError(f"не удалось выполнить запрос '{url}': {e}")
+
+    chunks = _iter_body(response, release, chunk_size)
+    if mode == 'lines':
+        return _iter_lines(chunks)
+    return (DarkBuffer(chunk) for chunk in chunks)
+
+
+def native_http_get_async(args):
+    """Like http.get(), but returns an awaitable; the request runs on the I/O executor."""
+    return run_async(native_http_get, args)
+
+def native_http_post_async(args):
+    """Like http.post(), but returns an awaitable; the request runs on the I/O executor."""
+    return run_async(native_http_post, args)
+
+def native_http_request_async(args):
+    """Like http.request(), but returns an awaitable; the request runs on the I/O executor."""
+    return run_async(native_http_request, args)
+
+def native_http_download_async(args):
+    """Like http.download(), but returns an awaitable; the download runs on the I/O executor."""
+    return run_async(native_http_download, args)
+
+
+def _start_server(args, func_name, interpreter):
+    if len(args) not in [3, 4]:
+        raise TypeError(f"http.{func_name}() takes 3 or 4 arguments (host, port, handler_fn, workers_optional)")
+    host, port, handler_fn = args[0], args[1], args[2]
+    if not isinstance(host, str):
+        raise TypeError(f"Host for http.{func_name}() must be a string")
+    if isinstance(port, bool) or not isinstance(port, int) or not 0 <= port <= 65535:
+        raise TypeError(f"Port for http.{func_name}() must be an integer in range 0..65535")
+    workers = args[3] if len(args) == 4 else SERVE_DEFAULT_WORKERS
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        raise TypeError(f"workers for http.{func_name}() must be a positive integer")
+    stats = ServerStats()
+    try:
+        httpd = PooledHTTPServer((host, port), make_handler_class(handler_fn, interpreter, stats), workers)
+    except OSError as e:
+        raise DarkRuntimeError(f"не удалось запустить сервер на {host}:{port}: {e}")
+    return DarkServer(httpd, stats)
+
+def _check_server(value, func_name):
+    if not isinstance(value, DarkServer):
+        raise TypeError(f"Argument to http.{func_name}() must be a server handle")
+    return value
+
+@with_interpreter
+def native_http_serve(args, interpreter):
+    """Serves HTTP with a pool of worker threads until interrupted; returns the final request statistics."""
+    server = _start_server(args, 'serve', interpreter)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return server.stats.snapshot()
+
+@with_interpreter
+def native_http_serve_background(args, interpreter):
+    """Starts an HTTP server in a background thread and returns its handle."""
+    server = _start_server(args, 'serve_background', interpreter)
+    server.thread = threading.Thread(target=server.httpd.serve_forever, daemon=True)
+    server.thread.start()
+    return server
+
+def native_http_server_port(args):
+    """Returns the port a server listens on (useful when started on port 0)."""
+    if len(args) != 1:
+        raise TypeError("http.server_port() takes 1 argument (server)")
+    return _check_server(args[0], 'server_port').address()[1]
+
+def native_http_server_stats(args):
+    """Returns request, error, connection and latency counters of a server."""
+    if len(args) != 1:
+        raise TypeError("http.server_stats() takes 1 argument (server)")
+    return _check_server(args[0], 'server_stats').stats.snapshot()
+
+def native_http_server_stop(args):
+    """Stops a background server and returns its final statistics."""
+    if len(args) != 1:
+        raise TypeError("http.server_stop() takes 1 argument (server)")
+    server = _check_server(args[0], 'server_stop')
+    server.stop()
+    return server.stats.snapshot()
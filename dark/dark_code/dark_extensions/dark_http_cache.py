@@ -0,0 +1,327 @@
+import hashlib
+import json as python_json
+import os as python_os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+
+CACHE_DEFAULTS = {
+    'max_entries': 256,
+    'max_bytes': 64 * 1024 * 1024,
+    'dir': None,
+    'disk_max_bytes': 512 * 1024 * 1024,
+}
+CACHE_FILE_SUFFIX = '.httpcache'
+BODY_FILE_SUFFIX = '.httpbody'
+VARY_FILE_SUFFIX = '.httpvary'
+BODY_HEADERS = {'content-length', 'content-encoding', 'transfer-encoding'}
+
+
+def parse_cache_control(value):
+    """Parses a Cache-Control header into a dict of lower-cased directives."""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, arg = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+def _expires_in(headers):
+    """Returns the freshness lifetime in seconds from Cache-Control max-age or Expires, or None."""
+    directives = parse_cache_control(headers.get('cache-control'))
+    if 'no-cache' in directives:
+        return 0
+    max_age = directives.get('max-age')
+    if max_age is not None:
+        try:
+            return max(int(max_age), 0)
+        except ValueError:
+            return 0
+    expires = headers.get('expires')
+    if expires:
+        try:
+            return max(parsedate_to_datetime(expires).timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            return 0
+    return None
+
+
+def vary_names(headers):
+    """Returns the sorted, lower-cased request header names listed in the Vary header of a response."""
+    for key, value in headers.items():
+        if key.lower() == 'vary':
+            return tuple(sorted({name.strip().lower() for name in value.split(',') if name.strip()}))
+    return ()
+
+def cache_key(url, names, request_headers):
+    """Builds the cache key from the URL and the values of the request headers named in Vary."""
+    if not names:
+        return url
+    lowered = {key.lower(): value for key, value in request_headers.items()}
+    return url + ''.join(f"\n{name}: {lowered.get(name, '')}" for name in names)
+
+def bypasses_cache(request_headers):
+    """Requests with credentials are never served from or stored in the shared cache."""
+    return any(key.lower() == 'authorization' for key in request_headers)
+
+
+class CacheEntry:
+    """Cached GET response with its validators and freshness lifetime."""
+    def __init__(self, url, status, headers, body, request_headers=None):
+        self.url = url
+        self.status = status
+        self.headers = dict(headers)
+        self.body = body
+        self.vary = vary_names(self.headers)
+        self.key = cache_key(url, self.vary, request_headers or {})
+        self.refresh(self.headers)
+
+    def refresh(self, headers):
+        """Merges headers of a new response (200 or 304) and restarts the freshness lifetime."""
+        if headers is not self.headers:
+            self.headers.update((key, value) for key, value in headers.items() if key.lower() not in BODY_HEADERS)
+        lowered = {key.lower(): value for key, value in self.headers.items()}
+        self.stored_at = time.time()
+        self.lifetime = _expires_in(lowered)
+        self.etag = lowered.get('etag')
+        self.last_modified = lowered.get('last-modified')
+
+    def is_fresh(self):
+        return self.lifetime is not None and time.time() - self.stored_at < self.lifetime
+
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def size(self):
+        return len(self.body)
+
+    def metadata(self):
+        """Status, headers and freshness of the entry as a JSON-serializable dict; the body is stored separately."""
+        return {
+            'url': self.url, 'key': self.key, 'status': self.status, 'headers': self.headers,
+            'stored_at': self.stored_at, 'size': len(self.body),
+        }
+
+    @classmethod
+    def from_metadata(cls, data, body):
+        entry = cls(data['url'], data['status'], data['headers'], body)
+        entry.key = data['key']
+        entry.stored_at = data['stored_at']
+        return entry
+
+
+def is_cacheable(status, headers):
+    """A response is stored only if it is a 200 that allows storing and can be reused or revalidated."""
+    if status != 200:
+        return False
+    lowered = {key.lower(): value for key, value in headers.items()}
+    if 'no-store' in parse_cache_control(lowered.get('cache-control')):
+        return False
+    if '*' in vary_names(lowered):
+        return False
+    return bool(lowered.get('etag') or lowered.get('last-modified') or _expires_in(lowered))
+
+
+class ResponseCache:
+    """
+    Кэш ответов на GET-запросы: LRU в памяти и необязательное хранилище на диске.
+    Свежие записи отдаются без запроса, устаревшие перепроверяются условным
+    запросом (If-None-Match / If-Modified-Since) и отдаются из кэша при ответе 304.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.enabled = False
+        self.config = dict(CACHE_DEFAULTS)
+        self.entries = OrderedDict()
+        self.variants = {}
+        self.memory_bytes = 0
+        self.stats = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0, 'disk_hits': 0}
+
+    def enable(self, config):
+        with self.lock:
+            self.config = dict(CACHE_DEFAULTS)
+            self.config.update(config)
+            self.enabled = True
+            if self.config['dir']:
+                python_os.makedirs(self.config['dir'], exist_ok=True)
+            self._evict_memory()
+
+    def disable(self):
+        with self.lock:
+            self.enabled = False
+            self.entries.clear()
+            self.variants.clear()
+            self.memory_bytes = 0
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.variants.clear()
+            self.memory_bytes = 0
+            directory = self.config['dir']
+            if directory and python_os.path.isdir(directory):
+                for name in python_os.listdir(directory):
+                    if name.endswith((CACHE_FILE_SUFFIX, BODY_FILE_SUFFIX, VARY_FILE_SUFFIX)):
+                        python_os.remove(python_os.path.join(directory, name))
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def _disk_path(self, key, suffix=CACHE_FILE_SUFFIX):
+        return python_os.path.join(self.config['dir'], hashlib.sha256(key.encode('utf-8')).hexdigest() + suffix)
+
+    def _vary_for(self, url):
+        """Returns the Vary header names last seen for url, from memory or the disk index."""
+        with self.lock:
+            names = self.variants.get(url)
+            if names is not None or not self.config['dir']:
+                return names or ()
+            path = self._disk_path(url, VARY_FILE_SUFFIX)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = python_json.load(f)
+        except (OSError, ValueError):
+            return ()
+        if not isinstance(data, dict) or data.get('url') != url or not isinstance(data.get('vary'), list):
+            return ()
+        names = tuple(data['vary'])
+        with self.lock:
+            self.variants.setdefault(url, names)
+        return names
+
+    def lookup(self, url, request_headers):
+        key = cache_key(url, self._vary_for(url), request_headers)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+            if not self.config['dir']:
+                return None
+            path = self._disk_path(key)
+        entry = self._read_disk(path, key)
+        if entry is None:
+            return None
+        with self.lock:
+            self.stats['disk_hits'] += 1
+            self._remember(entry)
+        return entry
+
+    def store(self, entry, stat='stores'):
+        with self.lock:
+            self.stats[stat] += 1
+            varies = self.variants.get(entry.url) != entry.vary
+            self.variants[entry.url] = entry.vary
+            self._remember(entry)
+            directory = self.config['dir']
+        if directory:
+            if varies:
+                self._write_file(self._disk_path(entry.url, VARY_FILE_SUFFIX),
+                                 python_json.dumps({'url': entry.url, 'vary': list(entry.vary)}).encode('utf-8'))
+            self._write_disk(entry)
+
+    def _remember(self, entry):
+        previous = self.entries.pop(entry.key, None)
+        if previous is not None:
+            self.memory_bytes -= previous.size()
+        if entry.size() > self.config['max_bytes']:
+            return
+        self.entries[entry.key] = entry
+        self.memory_bytes += entry.size()
+        self._evict_memory()
+
+    def _evict_memory(self):
+        while self.entries and (len(self.entries) > self.config['max_entries'] or self.memory_bytes > self.config['max_bytes']):
+            _, evicted = self.entries.popitem(last=False)
+            self.memory_bytes -= evicted.size()
+            self.stats['evictions'] += 1
+
+    def _write_file(self, path, data):
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            python_os.replace(temp_path, path)
+        except OSError:
+            if python_os.path.exists(temp_path):
+                python_os.remove(temp_path)
+            return False
+        return True
+
+    def _read_disk(self, path, key):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = python_json.load(f)
+            if not isinstance(data, dict) or data.get('key') != key:
+                return None
+            with open(path[:-len(CACHE_FILE_SUFFIX)] + BODY_FILE_SUFFIX, 'rb') as f:
+                body = f.read()
+            if len(body) != data['size']:
+                return None
+            return CacheEntry.from_metadata(data, body)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _write_disk(self, entry):
+        # The body goes first, so a reader never finds metadata without its body.
+        path = self._disk_path(entry.key)
+        metadata = python_json.dumps(entry.metadata(), ensure_ascii=False).encode('utf-8')
+        if self._write_file(path[:-len(CACHE_FILE_SUFFIX)] + BODY_FILE_SUFFIX, entry.body) and self._write_file(path, metadata):
+            self._evict_disk()
+
+    def _evict_disk(self):
+        directory = self.config['dir']
+        sizes, mtimes = {}, {}
+        total = 0
+        # Other threads and processes sharing the directory may evict the same files concurrently.
+        try:
+            with python_os.scandir(directory) as entries:
+                for dir_entry in entries:
+                    stem, suffix = python_os.path.splitext(dir_entry.path)
+                    if suffix in (CACHE_FILE_SUFFIX, BODY_FILE_SUFFIX):
+                        try:
+                            st = dir_entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        sizes[stem] = sizes.get(stem, 0) + st.st_size
+                        if suffix == CACHE_FILE_SUFFIX:
+                            mtimes[stem] = st.st_mtime
+                        total += st.st_size
+        except FileNotFoundError:
+            return
+        # Bodies left without metadata have no mtime entry and go first.
+        for stem in sorted(sizes, key=lambda stem: mtimes.get(stem, 0)):
+            if total <= self.config['disk_max_bytes']:
+                break
+            for suffix in (CACHE_FILE_SUFFIX, BODY_FILE_SUFFIX):
+                try:
+                    python_os.remove(stem + suffix)
+                except OSError:
+                    pass
+            total -= sizes[stem]
+            self.count('evictions')
+
+    def snapshot(self):
+        with self.lock:
+            result = dict(self.stats)
+            result.update({
+                'enabled': self.enabled,
+                'entries': len(self.entries),
+                'bytes': self.memory_bytes,
+            })
+            return result
+
+
+CACHE = ResponseCache()
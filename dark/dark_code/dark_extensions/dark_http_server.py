@@ -0,0 +1,219 @@
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+from dark_code.dark_extensions.dark_bytes import DarkBuffer
+
+KEEP_ALIVE_TIMEOUT = 5
+RESPONSE_DICT_KEYS = {'status', 'headers', 'body'}
+
+
+class ServerStats:
+    """Request and latency counters of a running server, updated from worker threads."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.active = 0
+        self.connections = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def begin(self):
+        with self.lock:
+            self.active += 1
+
+    def end(self, started, failed):
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.active -= 1
+            self.requests += 1
+            self.errors += failed
+            self.latency_total += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+
+    def connection(self):
+        with self.lock:
+            self.connections += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'active': self.active,
+                'connections': self.connections,
+                'avg_latency_ms': self.latency_total / self.requests * 1000 if self.requests else 0.0,
+                'max_latency_ms': self.latency_max * 1000,
+                'uptime': time.time() - self.started_at,
+            }
+
+
+def _request_dict(handler, body):
+    parts = urlsplit(handler.path)
+    return {
+        'method': handler.command,
+        'path': parts.path,
+        'query': dict(parse_qsl(parts.query, keep_blank_values=True)),
+        'headers': {key: value for key, value in handler.headers.items()},
+        'body': body.decode('utf-8', errors='replace'),
+        'client': handler.client_address[0],
+    }
+
+def _encode_response(result):
+    """Converts the value returned by a Dark handler into (status, headers, body_bytes)."""
+    if not isinstance(result, dict):
+        result = {'body': result}
+    unknown = set(result) - RESPONSE_DICT_KEYS
+    if unknown:
+        raise TypeError(f"Unknown response keys: {', '.join(sorted(map(str, unknown)))}")
+    status = result.get('status', 200)
+    if isinstance(status, bool) or not isinstance(status, int) or not 100 <= status <= 599:
+        raise TypeError("Response 'status' must be an integer HTTP status code")
+    headers = result.get('headers') or {}
+    if not isinstance(headers, dict):
+        raise TypeError("Response 'headers' must be a dictionary")
+    headers = {str(k): str(v) for k, v in headers.items()}
+    body = result.get('body')
+    content_type = 'text/plain; charset=utf-8'
+    if body is None:
+        data = b""
+    elif isinstance(body, DarkBuffer):
+        data = body.tobytes()
+        content_type = 'application/octet-stream'
+    elif isinstance(body, (dict, list)):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        content_type = 'application/json'
+    else:
+        data = str(body).encode('utf-8')
+    if not any(key.lower() == 'content-type' for key in headers):
+        headers['Content-Type'] = content_type
+    return status, headers, data
+
+
+def make_handler_class(handler_fn, interpreter, stats):
+    """
+    Builds a request handler class that decodes each request into a dict and calls the Dark handler.
+    Each pool thread calls the handler through its own interpreter.fork(), created on first use.
+    """
+    local = threading.local()
+
+    def call_handler(request):
+        worker = getattr(local, 'interpreter', None)
+        if worker is None:
+            worker = local.interpreter = interpreter.fork()
+        return worker.call_value(handler_fn, [request])
+
+    class DarkRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        server_version = 'Dark-Lang'
+        timeout = KEEP_ALIVE_TIMEOUT
+
+        def setup(self):
+            super().setup()
+            stats.connection()
+
+        def _reply(self, status, headers, data):
+            try:
+                self.send_response(status)
+                for key, value in headers.items():
+                    if key.lower() != 'content-length':
+                        self.send_header(key, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client has gone away (e.g. its read timed out); there is nobody to answer.
+                self.close_connection = True
+
+        def _dispatch(self):
+            started = time.perf_counter()
+            stats.begin()
+            failed = False
+            try:
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # Without a valid length the body cannot be framed, so the connection is dropped.
+                    failed = True
+                    self.close_connection = True
+                    self._reply(400, {'Content-Type': 'text/plain; charset=utf-8'}, b"Bad Request")
+                    return
+                body = self.rfile.read(length) if length > 0 else b""
+                try:
+                    status, headers, data = _encode_response(call_handler(_request_dict(self, body)))
+                except Exception as e:
+                    failed = True
+                    sys.stderr.write(f"http.serve: ошибка обработчика для {self.command} {self.path}: {e}\n")
+                    status, headers, data = 500, {'Content-Type': 'text/plain; charset=utf-8'}, b"Internal Server Error"
+                self._reply(status, headers, data)
+                if self.server.pending:
+                    self.close_connection = True
+            finally:
+                stats.end(started, failed)
+
+        do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = do_OPTIONS = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    return DarkRequestHandler
+
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """
+    HTTP-сервер, обслуживающий соединения фиксированным пулом рабочих потоков
+    вместо нового потока на каждое соединение. Соединения keep-alive занимают
+    рабочий поток, пока клиент не закроет их или не истечёт KEEP_ALIVE_TIMEOUT;
+    если новые соединения ждут свободного потока, keep-alive закрывается после ответа.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, handler_class, workers):
+        super().__init__(address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dark-http')
+        self.pending_lock = threading.Lock()
+        self.pending = 0
+
+    def process_request(self, request, client_address):
+        with self.pending_lock:
+            self.pending += 1
+        self.executor.submit(self._run_connection, request, client_address)
+
+    def _run_connection(self, request, client_address):
+        with self.pending_lock:
+            self.pending -= 1
+        self.process_request_thread(request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+
+class DarkServer:
+    """Handle of a server started by http.serve_background()."""
+    def __init__(self, httpd, stats):
+        self.httpd = httpd
+        self.stats = stats
+        self.thread = None
+
+    def address(self):
+        host, port = self.httpd.server_address[:2]
+        return host, port
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __str__(self):
+        host, port = self.address()
+        return f"<http server {host}:{port}>"
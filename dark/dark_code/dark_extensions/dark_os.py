@@ -1,6 +1,10 @@
 import os as python_os
+import fnmatch
+import stat as python_stat
 from dark_code.dark_exceptions import DarkRuntimeError
 
+SCAN_FILTER_KEYS = {'ext', 'pattern', 'min_size', 'max_size', 'newer_than', 'older_than', 'type', 'max_depth'}
+
 
 def native_os_getcwd(args):
     """Returns the current working directory."""
@@ -83,4 +87,114 @@ def native_os_system(args):
     if command == 'cls':
         command = 'cls' if python_os.name == 'nt' else 'clear'
         return python_os.system(command)
-    return python_os.system(args[0])
\ No newline at end of file
+    return python_os.system(args[0])
+
+def _scan_filter(filters, func_name):
+    """Validates a filter dictionary and returns a predicate over (name, is_dir, size, mtime)."""
+    if filters is None:
+        return None
+    if not isinstance(filters, dict):
+        raise TypeError(f"Second argument to os.{func_name}() must be a dictionary of filters")
+    unknown = set(filters) - SCAN_FILTER_KEYS
+    if unknown:
+        raise TypeError(f"Unknown filters for os.{func_name}(): {', '.join(sorted(map(str, unknown)))}")
+
+    extensions = filters.get('ext')
+    if isinstance(extensions, str):
+        extensions = [extensions]
+    if extensions is not None:
+        if not isinstance(extensions, list) or not all(isinstance(ext, str) for ext in extensions):
+            raise TypeError("Filter 'ext' must be a string or a list of strings")
+        extensions = tuple(ext.lower() if ext.startswith('.') else '.' + ext.lower() for ext in extensions)
+    pattern = filters.get('pattern')
+    if pattern is not None and not isinstance(pattern, str):
+        raise TypeError("Filter 'pattern' must be a string")
+    for key in ('min_size', 'max_size', 'newer_than', 'older_than', 'max_depth'):
+        if key in filters and (isinstance(filters[key], bool) or not isinstance(filters[key], (int, float))):
+            raise TypeError(f"Filter '{key}' must be a number")
+    entry_type = filters.get('type')
+    if entry_type not in (None, 'file', 'dir'):
+        raise TypeError("Filter 'type' must be \"file\" or \"dir\"")
+    min_size, max_size = filters.get('min_size'), filters.get('max_size')
+    newer_than, older_than = filters.get('newer_than'), filters.get('older_than')
+
+    def matches(name, is_dir, size, mtime):
+        if entry_type == 'file' and is_dir: return False
+        if entry_type == 'dir' and not is_dir: return False
+        if extensions is not None and not name.lower().endswith(extensions): return False
+        if pattern is not None and not fnmatch.fnmatch(name, pattern): return False
+        if min_size is not None and size < min_size: return False
+        if max_size is not None and size > max_size: return False
+        if newer_than is not None and mtime <= newer_than: return False
+        if older_than is not None and mtime >= older_than: return False
+        return True
+    return matches
+
+def _scan_entries(path, matches):
+    """Yields (entry_dict or None when filtered out, is_dir, path) for one directory, with a single stat per entry."""
+    with python_os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            is_link = python_stat.S_ISLNK(st.st_mode)
+            is_dir = python_stat.S_ISDIR(st.st_mode)
+            size = 0 if is_dir else st.st_size
+            if matches is not None and not matches(entry.name, is_dir, size, st.st_mtime):
+                yield None, is_dir, entry.path
+                continue
+            yield {
+                'path': entry.path,
+                'name': entry.name,
+                'is_dir': is_dir,
+                'is_file': python_stat.S_ISREG(st.st_mode),
+                'is_link': is_link,
+                'size': size,
+                'mtime': st.st_mtime,
+            }, is_dir, entry.path
+
+def _walk(root, matches, max_depth):
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        try:
+            found = list(_scan_entries(directory, matches))
+        except OSError:
+            continue
+        subdirs = []
+        for entry, is_dir, entry_path in found:
+            if entry is not None:
+                yield entry
+            if is_dir and (max_depth is None or depth < max_depth):
+                subdirs.append((entry_path, depth + 1))
+        stack.extend(reversed(subdirs))
+
+def _check_scan_root(path, func_name):
+    if not isinstance(path, str): raise TypeError(f"First argument to os.{func_name}() must be a string")
+    if not python_os.path.exists(path):
+        raise DarkRuntimeError(f"директория не найдена: '{path}'")
+    if not python_os.path.isdir(path):
+        raise DarkRuntimeError(f"путь не является директорией: '{path}'")
+
+def native_os_scan(args):
+    """Lists a directory as entry dictionaries (path, name, is_dir, is_file, is_link, size, mtime)."""
+    if len(args) not in (1, 2): raise TypeError("os.scan() takes 1 or 2 arguments (path, filters_optional)")
+    path = args[0]
+    filters = args[1] if len(args) == 2 else None
+    matches = _scan_filter(filters, 'scan')
+    _check_scan_root(path, 'scan')
+    try:
+        return [entry for entry, _, _ in _scan_entries(path, matches) if entry is not None]
+    except OSError as e:
+        raise DarkRuntimeError(f"не удалось получить список файлов в директории '{path}': {e.strerror}")
+
+def native_os_walk(args):
+    """Lazily walks a directory tree, yielding entry dictionaries for files and subdirectories."""
+    if len(args) not in (1, 2): raise TypeError("os.walk() takes 1 or 2 arguments (path, filters_optional)")
+    path = args[0]
+    filters = args[1] if len(args) == 2 else None
+    matches = _scan_filter(filters, 'walk')
+    _check_scan_root(path, 'walk')
+    max_depth = filters.get('max_depth') if filters else None
+    return _walk(path, matches, max_depth)
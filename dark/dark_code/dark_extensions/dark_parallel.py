@@ -0,0 +1,253 @@
+import atexit
+import io
+import math as python_math
+import os as python_os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dark_code.dark_exceptions import DarkError, DarkRuntimeError
+
+CHUNKS_PER_WORKER = 4
+LOCAL_BINDING_NODES = {'assign', 'for', 'func_def', 'async_func_def', 'try_except', 'class_def'}
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+_WORKER_STATE = {}
+
+
+def _walk_names(nodes, used, bound, module_refs):
+    """Collects referenced variable names, locally bound names and names used as `name.member` in an AST."""
+    stack = [nodes]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+            continue
+        if not isinstance(node, tuple) or not node or not isinstance(node[0], str):
+            continue
+        kind = node[0]
+        if kind == 'var':
+            used.add(node[1])
+            continue
+        if kind == 'member_access' and isinstance(node[1], tuple) and node[1][0] == 'var':
+            module_refs.add(node[1][1])
+        if kind in LOCAL_BINDING_NODES:
+            if kind == 'try_except':
+                if node[2]:
+                    bound.add(node[2])
+            else:
+                bound.add(node[1])
+            if kind in ('func_def', 'async_func_def'):
+                bound.update(node[2])
+        stack.extend(child for child in node[1:] if isinstance(child, (tuple, list)))
+
+
+def free_names(func):
+    """Returns (captured, module_names) for a Dark function: definition-scope names its body uses and modules it references."""
+    used, bound, module_refs = set(), set(func.params), set()
+    _walk_names(func.body, used, bound, module_refs)
+    env = func.definition_env
+    captured = {name for name in used if name in env and name not in bound}
+    module_names = {name for name in module_refs if name not in env and name not in bound}
+    return captured, module_names
+
+
+class FunctionPickler(pickle.Pickler):
+    """
+    Pickler, который передаёт функцию Dark без всего окружения определения:
+    сохраняются только используемые ею значения (рекурсивно для вложенных функций
+    и методов классов), а имена модулей собираются для импорта в рабочем процессе.
+    """
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.module_names = set()
+        self.captured = []
+
+    def reducer_override(self, obj):
+        from dark_code.interpreter import Function
+        if not isinstance(obj, Function):
+            return NotImplemented
+        captured, module_names = free_names(obj)
+        self.module_names.update(module_names)
+        env = {name: obj.definition_env[name] for name in captured}
+        env['__file__'] = obj.definition_env.get('__file__', '<main>')
+        self.captured.extend((obj.name, name, value) for name, value in env.items())
+        return (Function, (obj.name, obj.params, obj.body, {}, obj.is_async, obj.line), {'definition_env': env})
+
+
+def _find_unpicklable(captured):
+    for func_name, name, value in captured:
+        try:
+            FunctionPickler(io.BytesIO()).dump(value)
+        except Exception:
+            return func_name, name, value
+    return None
+
+def dump_payload(value, func_name):
+    """Pickles functions and data for worker processes; returns (bytes, module_names)."""
+    buffer = io.BytesIO()
+    pickler = FunctionPickler(buffer)
+    try:
+        pickler.dump(value)
+    except Exception as e:
+        culprit = _find_unpicklable(pickler.captured)
+        if culprit is not None:
+            owner, name, captured_value = culprit
+            raise DarkRuntimeError(
+                f"parallel.{func_name}(): значение '{name}' типа '{type(captured_value).__name__}', "
+                f"используемое функцией '{owner}', нельзя передать в рабочий процесс ({e})"
+            )
+        raise DarkRuntimeError(f"parallel.{func_name}(): данные нельзя передать в рабочий процесс ({e})")
+    return buffer.getvalue(), pickler.module_names
+
+
+def _init_worker():
+    from dark_code.interpreter import Interpreter
+    from dark_code.native_modules import NATIVE_MODULES
+    _WORKER_STATE['interpreter'] = Interpreter()
+    _WORKER_STATE['native_modules'] = NATIVE_MODULES
+
+def _is_importable(name, script_dir):
+    if name in _WORKER_STATE['interpreter'].modules:
+        return False
+    return name in _WORKER_STATE['native_modules'] or python_os.path.exists(python_os.path.join(script_dir, name + ".dark"))
+
+def _chunk_program(arity, spread, module_names):
+    """Builds the AST a worker runs for one chunk: imports, then results.append(fn(item...)) for each item."""
+    item = ('var', '__parallel_item__')
+    if spread:
+        call_args = [('index_access', item, ('num', i), 0) for i in range(arity)]
+    else:
+        call_args = [item]
+    call = ('func_call', ('var', '__parallel_fn__'), call_args, 0)
+    append = ('func_call', ('member_access', ('var', '__parallel_results__'), 'append', 0), [call], 0)
+    stmts = [('import', name, 0) for name in sorted(module_names)]
+    stmts.append(('for', '__parallel_item__', ('var', '__parallel_items__'), [('expr', append, 0)], 0))
+    return ('prog', stmts)
+
+def _run_chunk(func_payload, items_payload, module_names, spread):
+    """Worker entry point: runs the function over a chunk and returns ('ok', pickled results) or ('error', index, message)."""
+    if not _WORKER_STATE:
+        _init_worker()
+    func = pickle.loads(func_payload)
+    items = pickle.loads(items_payload)
+    results = []
+    env = {
+        '__file__': func.definition_env.get('__file__', '<main>'),
+        '__parallel_fn__': func,
+        '__parallel_items__': items,
+        '__parallel_results__': results,
+    }
+    script_dir = python_os.path.dirname(env['__file__']) or '.'
+    module_names = [name for name in module_names if _is_importable(name, script_dir)]
+    program = _chunk_program(len(func.params), spread, module_names)
+    try:
+        _WORKER_STATE['interpreter'].execute_ast(program, env, script_dir=script_dir)
+    except DarkError as e:
+        location = f" (строка {e.line})" if e.line else ""
+        return ('error', len(results), f"{e.message}{location}")
+    try:
+        return ('ok', dump_payload(results, 'map')[0])
+    except DarkRuntimeError as e:
+        return ('error', None, e.message)
+
+
+def _get_pool(workers):
+    with _POOLS_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            _POOLS[workers] = pool
+        return pool
+
+def _drop_pool(workers):
+    with _POOLS_LOCK:
+        pool = _POOLS.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+@atexit.register
+def shutdown_pools():
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _check_function(func, func_name):
+    from dark_code.interpreter import Function
+    if not isinstance(func, Function):
+        raise TypeError(f"First argument to parallel.{func_name}() must be a Dark function")
+    return func
+
+def _check_workers(args, index, func_name):
+    if len(args) <= index:
+        return python_os.cpu_count() or 1
+    workers = args[index]
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        raise TypeError(f"workers for parallel.{func_name}() must be a positive integer")
+    return workers
+
+def _parallel_apply(func, items, workers, spread, func_name):
+    if not items:
+        return []
+    func_payload, module_names = dump_payload(func, func_name)
+    chunk_size = max(1, python_math.ceil(len(items) / (workers * CHUNKS_PER_WORKER)))
+    chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+    chunk_payloads = []
+    for chunk in chunks:
+        payload, chunk_modules = dump_payload(chunk, func_name)
+        module_names |= chunk_modules
+        chunk_payloads.append(payload)
+
+    pool = _get_pool(workers)
+    futures = []
+    try:
+        futures = [pool.submit(_run_chunk, func_payload, payload, sorted(module_names), spread) for payload in chunk_payloads]
+        results = []
+        for start, future in zip(range(0, len(items), chunk_size), futures):
+            outcome = future.result()
+            if outcome[0] == 'error':
+                _, offset, message = outcome
+                where = f" для элемента {start + offset}" if offset is not None else ""
+                raise DarkRuntimeError(f"parallel.{func_name}(): ошибка в функции '{func.name}'{where}: {message}")
+            results.extend(pickle.loads(outcome[1]))
+        return results
+    except BrokenProcessPool as e:
+        _drop_pool(workers)
+        raise DarkRuntimeError(f"parallel.{func_name}(): рабочий процесс аварийно завершился: {e}")
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def native_parallel_map(args):
+    """Applies a Dark function to every item in worker processes; results keep input order."""
+    if len(args) not in (2, 3): raise TypeError("parallel.map() takes 2 or 3 arguments (function, items, workers_optional)")
+    func = _check_function(args[0], 'map')
+    if len(func.params) != 1:
+        raise TypeError(f"Function for parallel.map() must take 1 argument, '{func.name}' takes {len(func.params)}")
+    items = args[1]
+    if not isinstance(items, list):
+        raise TypeError("Second argument to parallel.map() must be a list")
+    return _parallel_apply(func, items, _check_workers(args, 2, 'map'), False, 'map')
+
+def native_parallel_starmap(args):
+    """Calls a Dark function with each list of arguments in worker processes; results keep input order."""
+    if len(args) not in (2, 3): raise TypeError("parallel.starmap() takes 2 or 3 arguments (function, argument_lists, workers_optional)")
+    func = _check_function(args[0], 'starmap')
+    items = args[1]
+    if not isinstance(items, list) or not all(isinstance(item, list) for item in items):
+        raise TypeError("Second argument to parallel.starmap() must be a list of argument lists")
+    arity = len(func.params)
+    for index, item in enumerate(items):
+        if len(item) != arity:
+            raise TypeError(f"Argument list {index} for parallel.starmap() has {len(item)} values, '{func.name}' takes {arity}")
+    return _parallel_apply(func, items, _check_workers(args, 2, 'starmap'), True, 'starmap')
+
+def native_parallel_workers(args):
+    """Returns the default number of worker processes (the CPU count)."""
+    if args: raise TypeError("parallel.workers() takes no arguments")
+    return python_os.cpu_count() or 1
@@ -0,0 +1,220 @@
+import os as python_os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PROCESS_OPTION_KEYS = {'cwd', 'env', 'input', 'timeout'}
+
+
+class DarkProcess:
+    """
+    Дескриптор процесса, запущенного process.spawn(); вывод читается фоновыми потоками.
+    Опция input записывается в stdin отдельным потоком, по истечении timeout процесс
+    завершается. Если команду не удалось запустить, возвращается уже завершённый
+    дескриптор, результат которого содержит ошибку - так же, как у process.run().
+    """
+    def __init__(self, popen, args, input_data=None, timeout=None, error=""):
+        self.popen = popen
+        self.args = args
+        self.timeout = timeout
+        self.timed_out = False
+        self.error = error
+        self.timer = None
+        self.stdout_parts = []
+        self.stderr_parts = []
+        self.readers = []
+        if popen is None:
+            return
+        self.readers = [
+            threading.Thread(target=self._drain, args=(popen.stdout, self.stdout_parts), daemon=True),
+            threading.Thread(target=self._drain, args=(popen.stderr, self.stderr_parts), daemon=True),
+        ]
+        if input_data is not None:
+            self.readers.append(threading.Thread(target=self._feed, args=(popen.stdin, input_data), daemon=True))
+        for reader in self.readers:
+            reader.start()
+        if timeout is not None:
+            self.timer = threading.Timer(timeout, self._expire)
+            self.timer.daemon = True
+            self.timer.start()
+
+    @staticmethod
+    def _drain(stream, parts):
+        for chunk in iter(lambda: stream.read(8192), ''):
+            parts.append(chunk)
+        stream.close()
+
+    @staticmethod
+    def _feed(stream, data):
+        # The process may exit without reading all of its input.
+        try:
+            stream.write(data)
+            stream.close()
+        except OSError:
+            pass
+
+    def _expire(self):
+        if self.popen.poll() is None:
+            self.timed_out = True
+            self.popen.kill()
+
+    def finished(self):
+        return self.popen is None or self.popen.poll() is not None
+
+    def wait(self, timeout=None):
+        """Returns False if the process is still running after timeout seconds."""
+        if self.popen is None:
+            return True
+        try:
+            self.popen.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return False
+        return True
+
+    def kill(self):
+        if not self.finished():
+            self.popen.kill()
+
+    def result(self):
+        if self.popen is None:
+            return _result(-1, "", "", error=self.error)
+        for reader in self.readers:
+            reader.join()
+        if self.timer is not None:
+            self.timer.cancel()
+        stdout, stderr = ''.join(self.stdout_parts), ''.join(self.stderr_parts)
+        if self.timed_out:
+            return _result(-1, stdout, stderr, timed_out=True, error=f"timeout after {self.timeout} s")
+        return _result(self.popen.returncode, stdout, stderr)
+
+    def __str__(self):
+        if self.popen is None:
+            return f"<process not started {self.args!r}: {self.error}>"
+        return f"<process {self.popen.pid} {self.args!r}>"
+
+
+def _result(code, stdout, stderr, timed_out=False, error=""):
+    return {
+        'code': code,
+        'stdout': stdout or "",
+        'stderr': stderr or "",
+        'timed_out': timed_out,
+        'error': error,
+    }
+
+def _check_command(cmd, func_name):
+    if not isinstance(cmd, list) or not cmd or not all(isinstance(part, (str, int, float)) for part in cmd):
+        raise TypeError(f"Command for process.{func_name}() must be a non-empty list of strings")
+    return [str(part) for part in cmd]
+
+def _parse_options(options, func_name):
+    if options is None:
+        return {}
+    if not isinstance(options, dict):
+        raise TypeError(f"Options for process.{func_name}() must be a dictionary")
+    unknown = set(options) - PROCESS_OPTION_KEYS
+    if unknown:
+        raise TypeError(f"Unknown options for process.{func_name}(): {', '.join(sorted(map(str, unknown)))}")
+    timeout = options.get('timeout')
+    if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float))):
+        raise TypeError("Option 'timeout' must be a number of seconds")
+    if options.get('input') is not None and not isinstance(options['input'], str):
+        raise TypeError("Option 'input' must be a string")
+    parsed = {}
+    if options.get('cwd') is not None:
+        parsed['cwd'] = str(options['cwd'])
+    if options.get('env') is not None:
+        if not isinstance(options['env'], dict):
+            raise TypeError("Option 'env' must be a dictionary")
+        env = dict(python_os.environ)
+        env.update({str(k): str(v) for k, v in options['env'].items()})
+        parsed['env'] = env
+    return parsed
+
+def _run_command(cmd, options, func_name='run'):
+    popen_options = _parse_options(options, func_name)
+    timeout = options.get('timeout') if options else None
+    stdin_data = options.get('input') if options else None
+    try:
+        completed = subprocess.run(
+            cmd, input=stdin_data, capture_output=True, text=True,
+            encoding='utf-8', errors='replace', timeout=timeout, **popen_options
+        )
+    except subprocess.TimeoutExpired as e:
+        stdout = e.stdout.decode('utf-8', errors='replace') if isinstance(e.stdout, bytes) else e.stdout
+        stderr = e.stderr.decode('utf-8', errors='replace') if isinstance(e.stderr, bytes) else e.stderr
+        return _result(-1, stdout, stderr, timed_out=True, error=f"timeout after {timeout} s")
+    except OSError as e:
+        return _result(-1, "", "", error=str(e))
+    return _result(completed.returncode, completed.stdout, completed.stderr)
+
+
+def native_process_run(args):
+    """Runs a command (list of arguments, no shell) and returns a dict with code, stdout and stderr."""
+    if len(args) not in (1, 2): raise TypeError("process.run() takes 1 or 2 arguments (command_list, options_optional)")
+    cmd = _check_command(args[0], 'run')
+    options = args[1] if len(args) == 2 else None
+    return _run_command(cmd, options)
+
+def native_process_spawn(args):
+    """Starts a command in the background and returns a process handle."""
+    if len(args) not in (1, 2): raise TypeError("process.spawn() takes 1 or 2 arguments (command_list, options_optional)")
+    cmd = _check_command(args[0], 'spawn')
+    options = args[1] if len(args) == 2 else None
+    popen_options = _parse_options(options, 'spawn')
+    stdin_data = options.get('input') if options else None
+    try:
+        popen = subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL if stdin_data is None else subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace', **popen_options
+        )
+    except OSError as e:
+        return DarkProcess(None, cmd, error=str(e))
+    return DarkProcess(popen, cmd, stdin_data, options.get('timeout') if options else None)
+
+def _check_handle(value, func_name, position="Argument"):
+    if not isinstance(value, DarkProcess):
+        raise TypeError(f"{position} to process.{func_name}() must be a process handle")
+    return value
+
+def native_process_poll(args):
+    """Returns true if a spawned process has finished, without blocking."""
+    if len(args) != 1: raise TypeError("process.poll() takes 1 argument (process)")
+    return _check_handle(args[0], 'poll').finished()
+
+def native_process_wait(args):
+    """Waits for a spawned process and returns its result dict, or false if the timeout expires."""
+    if len(args) not in (1, 2): raise TypeError("process.wait() takes 1 or 2 arguments (process, timeout_optional)")
+    handle = _check_handle(args[0], 'wait', "First argument")
+    timeout = args[1] if len(args) == 2 else None
+    if not handle.wait(timeout):
+        return False
+    return handle.result()
+
+def native_process_kill(args):
+    """Terminates a spawned process."""
+    if len(args) != 1: raise TypeError("process.kill() takes 1 argument (process)")
+    _check_handle(args[0], 'kill').kill()
+    return True
+
+def native_process_pid(args):
+    """Returns the operating system id of a spawned process, or -1 if it could not be started."""
+    if len(args) != 1: raise TypeError("process.pid() takes 1 argument (process)")
+    handle = _check_handle(args[0], 'pid')
+    return -1 if handle.popen is None else handle.popen.pid
+
+def native_process_run_many(args):
+    """Runs a batch of commands with at most max_parallel running at once; results keep input order."""
+    if len(args) not in (2, 3): raise TypeError("process.run_many() takes 2 or 3 arguments (commands_list, max_parallel, options_optional)")
+    cmds, max_parallel = args[0], args[1]
+    if not isinstance(cmds, list): raise TypeError("First argument to process.run_many() must be a list of commands")
+    if not isinstance(max_parallel, int) or max_parallel < 1:
+        raise TypeError("Second argument to process.run_many() must be a positive integer")
+    options = args[2] if len(args) == 3 else None
+    _parse_options(options, 'run_many')
+    cmds = [_check_command(cmd, 'run_many') for cmd in cmds]
+    if not cmds:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(cmds))) as pool:
+        return list(pool.map(lambda cmd: _run_command(cmd, options, 'run_many'), cmds))
@@ -0,0 +1,18 @@
+from dark_code.metrics import METRICS
+
+
+def native_runtime_metrics(args):
+    """Returns a dictionary of the interpreter counters: statements, calls, native calls by module, builtin method calls, instances, errors, compile cache and time."""
+    if args: raise TypeError("runtime.metrics() takes no arguments")
+    return METRICS.snapshot()
+
+def native_runtime_reset(args):
+    """Resets all interpreter counters to zero."""
+    if args: raise TypeError("runtime.reset() takes no arguments")
+    METRICS.reset()
+    return 0
+
+def native_runtime_report(args):
+    """Returns the interpreter counters as a human-readable report."""
+    if args: raise TypeError("runtime.report() takes no arguments")
+    return METRICS.format_report()
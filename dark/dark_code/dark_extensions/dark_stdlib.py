@@ -1,29 +1,131 @@
 import json as python_json
+import heapq
+import itertools
+from collections import deque
 from dark_code.dark_exceptions import DarkRuntimeError
 
 
+class DarkHeap:
+    """Binary min-heap (priority queue) backed by heapq; ties keep insertion order."""
+    def __init__(self, key=None):
+        self.key = key
+        self.key_caller = None
+        self.key_caller_epoch = None
+        self.entries = []
+        self._counter = itertools.count()
+
+    def push(self, item, priority):
+        entry = (priority, next(self._counter), item)
+        try:
+            heapq.heappush(self.entries, entry)
+        except TypeError:
+            # heappush has already appended the entry and may have moved it part of the way up.
+            self.entries = [other for other in self.entries if other is not entry]
+            heapq.heapify(self.entries)
+            raise DarkRuntimeError(f"приоритет {priority!r} нельзя сравнить с приоритетами элементов кучи")
+
+    def pop(self):
+        return heapq.heappop(self.entries)[2]
+
+    def peek(self):
+        return self.entries[0][2]
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return (entry[2] for entry in sorted(self.entries))
+
+    def __str__(self):
+        return f"heap({list(self)})"
+
+
+def _range_bounds(name, args):
+    if len(args) not in (2, 3): raise TypeError(f"stdlib.{name}() takes 2 or 3 arguments (start, stop, step_optional)")
+    if not all(isinstance(arg, (int, float)) for arg in args):
+        raise TypeError(f"Arguments for stdlib.{name}() must be numbers")
+    start, stop = int(args[0]), int(args[1])
+    step = int(args[2]) if len(args) == 3 else 1
+    if step == 0:
+        raise TypeError(f"stdlib.{name}() step must not be zero")
+    return start, stop, step
+
 def native_stdlib_range(args):
-    """Returns a list of numbers in the range [start, stop)."""
-    if len(args) != 2: raise TypeError("stdlib.range() takes 2 arguments (start, stop)")
-    start, stop = args
-    if not isinstance(start, (int, float)) or not isinstance(stop, (int, float)):
-        raise TypeError("Arguments for stdlib.range() must be numbers")
-    return list(range(int(start), int(stop)))
+    """Returns a list of numbers in the range [start, stop) with an optional step."""
+    return list(range(*_range_bounds('range', args)))
+
+def native_stdlib_irange(args):
+    """Returns a lazy range of numbers [start, stop) that is not materialized into a list."""
+    return range(*_range_bounds('irange', args))
+
+def loop_range(args):
+    """Lazy stdlib.range() used when the call is the iterable of a for loop, where the list is never visible."""
+    return range(*_range_bounds('range', args))
+
+def native_stdlib_list(args):
+    """Materializes any iterable (range, dict keys, file lines, generator) into a list."""
+    if len(args) != 1: raise TypeError("stdlib.list() takes 1 argument (iterable)")
+    iterable = args[0]
+    if isinstance(iterable, dict):
+        return list(iterable.keys())
+    try:
+        return list(iterable)
+    except TypeError:
+        raise TypeError(f"Argument to stdlib.list() is not iterable: '{type(iterable).__name__}'")
+
+def native_stdlib_set(args):
+    """Creates a hash set, optionally filled from a list or another iterable."""
+    if len(args) > 1: raise TypeError("stdlib.set() takes 0 or 1 argument (iterable_optional)")
+    if not args:
+        return set()
+    iterable = args[0]
+    if isinstance(iterable, dict):
+        iterable = iterable.keys()
+    try:
+        items = set(iterable)
+    except TypeError:
+        raise TypeError("Argument to stdlib.set() must be an iterable of strings, numbers or booleans")
+    for item in items:
+        if not isinstance(item, (str, int, float, bool)):
+            raise TypeError(f"Unsupported set element type: '{type(item).__name__}'")
+    return items
+
+def native_stdlib_deque(args):
+    """Creates a double-ended queue with O(1) push/pop at both ends."""
+    if len(args) > 2: raise TypeError("stdlib.deque() takes 0 to 2 arguments (iterable_optional, maxlen_optional)")
+    iterable = args[0] if args else ()
+    maxlen = args[1] if len(args) == 2 else None
+    if maxlen is not None and (not isinstance(maxlen, int) or maxlen < 0):
+        raise TypeError("Second argument to stdlib.deque() (maxlen) must be a non-negative integer")
+    if isinstance(iterable, dict):
+        iterable = iterable.keys()
+    try:
+        return deque(iterable, maxlen)
+    except TypeError:
+        raise TypeError("First argument to stdlib.deque() must be iterable")
+
+def native_stdlib_heap(args):
+    """Creates a min-heap priority queue, optionally ordered by a key function."""
+    if len(args) > 1: raise TypeError("stdlib.heap() takes 0 or 1 argument (key_function_optional)")
+    return DarkHeap(args[0] if args else None)
 
 def native_stdlib_list_contains(args):
     """Checks if an item is in a list."""
     if len(args) != 2: raise TypeError("stdlib.list_contains() takes 2 arguments (list, item)")
     haystack, needle = args
-    if not isinstance(haystack, list):
+    if not isinstance(haystack, (list, range, set)):
         raise TypeError("First argument to stdlib.list_contains() must be a list")
     return needle in haystack
 
 def native_stdlib_list_join(args):
-    """Joins list elements into a string with a separator."""
+    """Joins list (or irange) elements into a string with a separator."""
     if len(args) != 2: raise TypeError("stdlib.list_join() takes 2 arguments (list, separator)")
     items, separator = args
-    if not isinstance(items, list):
-        raise TypeError("First argument to stdlib.list_join() must be a list")
+    if not isinstance(items, (list, range)):
+        raise TypeError("First argument to stdlib.list_join() must be a list or an irange")
     if not isinstance(separator, str):
         raise TypeError("Second argument to stdlib.list_join() must be a string")
     return separator.join(map(str, items))
@@ -0,0 +1,183 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dark_code.dark_exceptions import DarkError, DarkRuntimeError
+
+IO_WORKERS = 64
+
+_CONTEXT = threading.local()
+_LOOP_LOCK = threading.Lock()
+_LOOP = None
+_IO_EXECUTOR = None
+
+
+class Scheduler:
+    """
+    Эстафета (baton) для кооперативных задач одного корневого потока.
+    Код Dark выполняет только поток, держащий эстафету; задача отдаёт её
+    лишь в точках await, поэтому между ними состояние не меняется извне.
+    """
+    def __init__(self):
+        self.baton = threading.Lock()
+        self.local = threading.local()
+
+    def holds(self):
+        return getattr(self.local, 'holding', False)
+
+    def acquire(self):
+        self.baton.acquire()
+        self.local.holding = True
+
+    def release(self):
+        self.local.holding = False
+        self.baton.release()
+
+    def ensure_held(self):
+        if not self.holds():
+            self.acquire()
+
+    def wait(self, future):
+        """Waits for a future, letting other tasks run in the meantime."""
+        if not self.holds():
+            return future.result()
+        self.release()
+        try:
+            return future.result()
+        finally:
+            self.acquire()
+
+
+def current_scheduler():
+    scheduler = getattr(_CONTEXT, 'scheduler', None)
+    if scheduler is None:
+        scheduler = _CONTEXT.scheduler = Scheduler()
+    return scheduler
+
+
+class DarkTask:
+    """
+    Задача Dark: результат вызова async-функции. Запускается при первом await
+    или через tasks.spawn() и выполняется в своём потоке под эстафетой
+    планировщика того потока, который её запустил.
+    """
+    def __init__(self, name, runner):
+        self.name = name
+        self.runner = runner
+        self.future = Future()
+        self.started = False
+
+    def start(self):
+        if self.started:
+            return self
+        self.started = True
+        scheduler = current_scheduler()
+        scheduler.ensure_held()
+        threading.Thread(target=self._run, args=(scheduler,), daemon=True, name=f"dark-task-{self.name}").start()
+        return self
+
+    def _run(self, scheduler):
+        _CONTEXT.scheduler = scheduler
+        scheduler.acquire()
+        try:
+            result, error = self.runner(), None
+        except BaseException as e:
+            result, error = None, e
+        finally:
+            scheduler.release()
+        if error is not None:
+            self.future.set_exception(error)
+        else:
+            self.future.set_result(result)
+
+    def state(self):
+        if not self.started:
+            return "pending"
+        return "done" if self.future.done() else "running"
+
+    def __str__(self):
+        return f"<task {self.name} {self.state()}>"
+
+
+def event_loop():
+    """Returns the asyncio loop that runs in a background thread, starting it on first use."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, daemon=True, name="dark-event-loop").start()
+            _LOOP = loop
+        return _LOOP
+
+def _io_executor():
+    global _IO_EXECUTOR
+    with _LOOP_LOCK:
+        if _IO_EXECUTOR is None:
+            _IO_EXECUTOR = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='dark-io')
+        return _IO_EXECUTOR
+
+def run_async(func, args):
+    """Runs a blocking native function off the interpreter threads and returns an awaitable future."""
+    loop = event_loop()
+    executor = _io_executor()
+
+    async def call():
+        return await loop.run_in_executor(executor, func, args)
+    return asyncio.run_coroutine_threadsafe(call(), loop)
+
+def _as_future(value):
+    if isinstance(value, DarkTask):
+        return value.start().future
+    if isinstance(value, Future):
+        return value
+    future = Future()
+    future.set_result(value)
+    return future
+
+def await_value(value, line=None):
+    """Implements `await`: starts a pending task if needed and waits for a task or future, yielding to other tasks."""
+    if not isinstance(value, (DarkTask, Future)):
+        return value
+    future = _as_future(value)
+    try:
+        return current_scheduler().wait(future)
+    except DarkError:
+        raise
+    except Exception as e:
+        raise DarkRuntimeError(f"ошибка асинхронной операции: {e}", line=line) from e
+
+
+async def _gather(futures):
+    return list(await asyncio.gather(*(asyncio.wrap_future(future) for future in futures)))
+
+
+def native_tasks_spawn(args):
+    """Starts a task returned by an async function call without waiting for it; returns the task."""
+    if len(args) != 1: raise TypeError("tasks.spawn() takes 1 argument (task)")
+    task = args[0]
+    if not isinstance(task, DarkTask): raise TypeError("Argument to tasks.spawn() must be a task (the result of calling an async function)")
+    return task.start()
+
+def native_tasks_gather(args):
+    """Starts all tasks in a list and returns an awaitable that resolves to the list of their results."""
+    if len(args) != 1: raise TypeError("tasks.gather() takes 1 argument (list_of_tasks)")
+    items = args[0]
+    if not isinstance(items, list): raise TypeError("Argument to tasks.gather() must be a list")
+    futures = [_as_future(item) for item in items]
+    return asyncio.run_coroutine_threadsafe(_gather(futures), event_loop())
+
+def native_tasks_sleep(args):
+    """Returns an awaitable that completes after the given number of seconds without blocking other tasks."""
+    if len(args) != 1: raise TypeError("tasks.sleep() takes 1 argument (seconds)")
+    seconds = args[0]
+    if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or seconds < 0:
+        raise TypeError("Argument to tasks.sleep() must be a non-negative number")
+    return asyncio.run_coroutine_threadsafe(asyncio.sleep(seconds, 0), event_loop())
+
+def native_tasks_done(args):
+    """Returns true if a task has finished."""
+    if len(args) != 1: raise TypeError("tasks.done() takes 1 argument (task)")
+    task = args[0]
+    if isinstance(task, DarkTask):
+        return task.started and task.future.done()
+    if not isinstance(task, Future): raise TypeError("Argument to tasks.done() must be a task")
+    return task.done()
@@ -0,0 +1,28 @@
+from dark_code.dark_exceptions import DarkRuntimeError
+
+
+def _message(args, index, default):
+    return str(args[index]) if len(args) > index else default
+
+def native_test_assert_true(args):
+    """Fails the current test unless the value is truthy."""
+    if len(args) not in (1, 2): raise TypeError("test.assert_true() takes 1 or 2 arguments (value, message_optional)")
+    # Imported here: the interpreter module imports every native module, this one included.
+    from dark_code.interpreter import is_truthy
+    value = args[0]
+    if not is_truthy(value):
+        raise DarkRuntimeError(_message(args, 1, f"ожидалось истинное значение, получено {value!r}"))
+    return 0
+
+def native_test_assert_equal(args):
+    """Fails the current test unless the two values are equal."""
+    if len(args) not in (2, 3): raise TypeError("test.assert_equal() takes 2 or 3 arguments (actual, expected, message_optional)")
+    actual, expected = args[0], args[1]
+    if actual != expected:
+        raise DarkRuntimeError(_message(args, 2, f"ожидалось {expected!r}, получено {actual!r}"))
+    return 0
+
+def native_test_fail(args):
+    """Fails the current test with a message."""
+    if len(args) > 1: raise TypeError("test.fail() takes 0 or 1 argument (message_optional)")
+    raise DarkRuntimeError(_message(args, 0, "тест провален"))
@@ -0,0 +1,155 @@
+import threading
+from collections import deque
+from dark_code.dark_exceptions import DarkError, DarkRuntimeError
+from dark_code.native_callbacks import with_caller
+
+
+class DarkChannel:
+    """
+    Ограниченный канал между потоками Dark: очередь deque под собственной блокировкой
+    с условиями not_empty и not_full. После close() получатели дочитывают оставшиеся
+    значения, а затем recv() сообщает о закрытии, и цикл for по каналу завершается.
+    """
+    def __init__(self, capacity=0):
+        self.capacity = capacity
+        self.items = deque()
+        self.closed = False
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def send(self, value):
+        # The closed check and the append happen under the lock that close() also holds,
+        # so no value can be added after close(). A sender blocked on a full channel is
+        # woken by close() and fails as well.
+        with self.lock:
+            self.not_full.wait_for(lambda: self.closed or not 0 < self.capacity <= len(self.items))
+            if self.closed:
+                raise DarkRuntimeError("отправка в закрытый канал")
+            self.items.append(value)
+            self.not_empty.notify()
+        return 0
+
+    def _take(self, timeout=None):
+        """Returns (True, value) for the next value or (False, None) once the channel is closed and drained."""
+        with self.lock:
+            if not self.not_empty.wait_for(lambda: self.items or self.closed, timeout):
+                raise DarkRuntimeError(f"истекло время ожидания канала ({timeout} с)")
+            if not self.items:
+                return False, None
+            value = self.items.popleft()
+            self.not_full.notify()
+            return True, value
+
+    def recv(self, timeout=None):
+        if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout < 0):
+            raise TypeError("channel.recv() timeout must be a non-negative number")
+        received, value = self._take(timeout)
+        if not received:
+            raise DarkRuntimeError("канал закрыт")
+        return value
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.not_empty.notify_all()
+            self.not_full.notify_all()
+        return 0
+
+    def __len__(self):
+        with self.lock:
+            return len(self.items)
+
+    def __iter__(self):
+        while True:
+            received, value = self._take()
+            if not received:
+                return
+            yield value
+
+    def __str__(self):
+        state = "closed" if self.closed else "open"
+        return f"<channel {state}, {len(self)} queued>"
+
+
+class DarkThread:
+    """Handle of a Dark function running in its own thread; join() returns its result."""
+    def __init__(self, name):
+        self.name = name
+        self.thread = None
+        self.result = None
+        self.error = None
+
+    def run(self, call_function, func, args):
+        try:
+            self.result = call_function(func, args)
+        except DarkError as e:
+            self.error = e
+        except Exception as e:
+            self.error = DarkRuntimeError(str(e))
+
+    def join(self, timeout=None):
+        if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout < 0):
+            raise TypeError("thread.join() timeout must be a non-negative number")
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            raise DarkRuntimeError(f"поток '{self.name}' не завершился за {timeout} с")
+        if self.error is not None:
+            raise DarkRuntimeError(f"ошибка в потоке '{self.name}': {self.error.message}")
+        return self.result
+
+    def is_alive(self):
+        return self.thread.is_alive()
+
+    def __str__(self):
+        state = "running" if self.thread.is_alive() else "finished"
+        return f"<thread {self.name} {state}>"
+
+
+def _optional_arg(args, index):
+    return args[index] if len(args) > index else None
+
+
+@with_caller
+def native_threads_start(args, call_function):
+    """Runs a Dark function with a list of arguments in a new thread; returns a joinable handle."""
+    if len(args) not in (1, 2): raise TypeError("threads.start() takes 1 or 2 arguments (function, args_list_optional)")
+    func = args[0]
+    func_args = args[1] if len(args) == 2 else []
+    if not isinstance(func_args, list): raise TypeError("Second argument to threads.start() must be a list of arguments")
+    handle = DarkThread(getattr(func, 'name', 'native'))
+    handle.thread = threading.Thread(target=handle.run, args=(call_function, func, list(func_args)), daemon=True)
+    handle.thread.start()
+    return handle
+
+def native_threads_join(args):
+    """Waits for a thread (optionally up to timeout seconds) and returns the value its function returned."""
+    if len(args) not in (1, 2): raise TypeError("threads.join() takes 1 or 2 arguments (thread, timeout_optional)")
+    if not isinstance(args[0], DarkThread): raise TypeError("First argument to threads.join() must be a thread handle")
+    return args[0].join(_optional_arg(args, 1))
+
+def native_threads_channel(args):
+    """Creates a channel; with capacity > 0, send() blocks while the channel is full."""
+    if len(args) > 1: raise TypeError("threads.channel() takes 0 or 1 argument (capacity_optional)")
+    capacity = args[0] if args else 0
+    if isinstance(capacity, bool) or not isinstance(capacity, int) or capacity < 0:
+        raise TypeError("Channel capacity must be a non-negative integer")
+    return DarkChannel(capacity)
+
+def native_threads_send(args):
+    """Sends a value to a channel, blocking while a bounded channel is full."""
+    if len(args) != 2: raise TypeError("threads.send() takes 2 arguments (channel, value)")
+    if not isinstance(args[0], DarkChannel): raise TypeError("First argument to threads.send() must be a channel")
+    return args[0].send(args[1])
+
+def native_threads_recv(args):
+    """Receives the next value from a channel, waiting up to timeout seconds if given."""
+    if len(args) not in (1, 2): raise TypeError("threads.recv() takes 1 or 2 arguments (channel, timeout_optional)")
+    if not isinstance(args[0], DarkChannel): raise TypeError("First argument to threads.recv() must be a channel")
+    return args[0].recv(_optional_arg(args, 1))
+
+def native_threads_close(args):
+    """Closes a channel; receivers get the remaining values, then the end of the channel."""
+    if len(args) != 1: raise TypeError("threads.close() takes 1 argument (channel)")
+    if not isinstance(args[0], DarkChannel): raise TypeError("Argument to threads.close() must be a channel")
+    return args[0].close()
@@ -0,0 +1,201 @@
+import array as python_array
+import itertools
+import math as python_math
+import operator as python_operator
+from dark_code.dark_exceptions import DarkRuntimeError
+
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
+
+VECTOR_OPS = {
+    '+': python_operator.add,
+    '-': python_operator.sub,
+    '*': python_operator.mul,
+    '/': python_operator.truediv,
+}
+
+
+class DarkVector:
+    """
+    Типизированный вектор чисел float64.
+    Данные хранятся в array.array (или в массиве NumPy, если он установлен) и доступны
+    через memoryview, поэтому срезы являются представлениями без копирования.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(memoryview(python_array.array('d', values)))
+
+    def as_numpy(self):
+        return _numpy.frombuffer(self.data, dtype=_numpy.float64)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"vec elements must be numbers, not '{type(value).__name__}'")
+        self.data[index] = float(value)
+
+    def __eq__(self, other):
+        return isinstance(other, DarkVector) and self.data == other.data
+
+    def __str__(self):
+        values = self.data[:10].tolist()
+        suffix = ", ..." if len(self.data) > 10 else ""
+        return f"vec([{', '.join(map(str, values))}{suffix}])"
+
+
+def _check_vector(value, func_name):
+    if not isinstance(value, DarkVector):
+        raise TypeError(f"Argument to vec.{func_name}() must be a vec")
+    return value
+
+
+def vector_binop(op, a, b, line=None):
+    """Elementwise arithmetic between two vectors or a vector and a number."""
+    if op == '==':
+        return a == b
+    if op == '!=':
+        return not a == b
+    if op not in VECTOR_OPS:
+        raise DarkRuntimeError(f"оператор '{op}' не поддерживается для vec", line=line)
+    for operand in (a, b):
+        if not isinstance(operand, DarkVector) and (isinstance(operand, bool) or not isinstance(operand, (int, float))):
+            raise DarkRuntimeError(f"неподдерживаемые типы операндов для '{op}': '{type(a).__name__}' и '{type(b).__name__}'", line=line)
+    if isinstance(a, DarkVector) and isinstance(b, DarkVector) and len(a) != len(b):
+        raise DarkRuntimeError(f"длины векторов не совпадают: {len(a)} и {len(b)}", line=line)
+
+    func = VECTOR_OPS[op]
+    if _numpy is not None:
+        left = a.as_numpy() if isinstance(a, DarkVector) else a
+        right = b.as_numpy() if isinstance(b, DarkVector) else b
+        if op == '/' and _numpy.any(right == 0):
+            raise DarkRuntimeError("деление на ноль", line=line)
+        return DarkVector(memoryview(_numpy.ascontiguousarray(func(left, right), dtype=_numpy.float64)))
+
+    left = a.data if isinstance(a, DarkVector) else itertools.repeat(a)
+    right = b.data if isinstance(b, DarkVector) else itertools.repeat(b)
+    try:
+        return DarkVector.from_values(map(func, left, right))
+    except ZeroDivisionError:
+        raise DarkRuntimeError("деление на ноль", line=line)
+
+
+def vector_sum(v):
+    if _numpy is not None:
+        return float(v.as_numpy().sum())
+    return python_math.fsum(v.data)
+
+def vector_mean(v):
+    if not len(v):
+        raise DarkRuntimeError("vec.mean() вызван для пустого вектора")
+    return vector_sum(v) / len(v)
+
+def vector_min(v):
+    if not len(v):
+        raise DarkRuntimeError("vec.min() вызван для пустого вектора")
+    return min(v.data)
+
+def vector_max(v):
+    if not len(v):
+        raise DarkRuntimeError("vec.max() вызван для пустого вектора")
+    return max(v.data)
+
+def vector_dot(a, b):
+    if not isinstance(b, DarkVector):
+        raise DarkRuntimeError("vec.dot() ожидает второй аргумент типа vec")
+    if len(a) != len(b):
+        raise DarkRuntimeError(f"длины векторов не совпадают: {len(a)} и {len(b)}")
+    if _numpy is not None:
+        return float(_numpy.dot(a.as_numpy(), b.as_numpy()))
+    return python_math.fsum(map(python_operator.mul, a.data, b.data))
+
+def vector_slice(v, start, end):
+    if not isinstance(start, int) or not isinstance(end, int):
+        raise TypeError("vec.slice() bounds must be integers")
+    return DarkVector(v.data[start:end])
+
+def vector_copy(v):
+    return DarkVector.from_values(v.data)
+
+
+def native_vec_new(args):
+    """Creates a vector of n elements filled with a value (0.0 by default)."""
+    if len(args) not in (1, 2): raise TypeError("vec.new() takes 1 or 2 arguments (size, fill_optional)")
+    size = args[0]
+    fill = args[1] if len(args) == 2 else 0.0
+    if not isinstance(size, int) or size < 0:
+        raise TypeError("First argument to vec.new() must be a non-negative integer")
+    if not isinstance(fill, (int, float)):
+        raise TypeError("Second argument to vec.new() must be a number")
+    return DarkVector(memoryview(python_array.array('d', [float(fill)]) * size))
+
+def native_vec_from_list(args):
+    """Converts a list (or any iterable of numbers) into a vector."""
+    if len(args) != 1: raise TypeError("vec.from_list() takes 1 argument (list)")
+    values = args[0]
+    if isinstance(values, DarkVector):
+        return vector_copy(values)
+    try:
+        return DarkVector.from_values(values)
+    except TypeError:
+        raise TypeError("vec.from_list() expects an iterable of numbers")
+
+def native_vec_to_list(args):
+    """Converts a vector into a list of floats."""
+    if len(args) != 1: raise TypeError("vec.to_list() takes 1 argument (vec)")
+    return _check_vector(args[0], 'to_list').data.tolist()
+
+def native_vec_len(args):
+    """Returns the number of elements in a vector."""
+    if len(args) != 1: raise TypeError("vec.len() takes 1 argument (vec)")
+    return len(_check_vector(args[0], 'len'))
+
+def native_vec_slice(args):
+    """Returns a zero-copy view of the elements [start, end)."""
+    if len(args) != 3: raise TypeError("vec.slice() takes 3 arguments (vec, start, end)")
+    return vector_slice(_check_vector(args[0], 'slice'), args[1], args[2])
+
+def native_vec_copy(args):
+    """Returns an independent copy of a vector or view."""
+    if len(args) != 1: raise TypeError("vec.copy() takes 1 argument (vec)")
+    return vector_copy(_check_vector(args[0], 'copy'))
+
+def native_vec_sum(args):
+    """Returns the sum of all elements."""
+    if len(args) != 1: raise TypeError("vec.sum() takes 1 argument (vec)")
+    return vector_sum(_check_vector(args[0], 'sum'))
+
+def native_vec_mean(args):
+    """Returns the arithmetic mean of all elements."""
+    if len(args) != 1: raise TypeError("vec.mean() takes 1 argument (vec)")
+    return vector_mean(_check_vector(args[0], 'mean'))
+
+def native_vec_min(args):
+    """Returns the smallest element."""
+    if len(args) != 1: raise TypeError("vec.min() takes 1 argument (vec)")
+    return vector_min(_check_vector(args[0], 'min'))
+
+def native_vec_max(args):
+    """Returns the largest element."""
+    if len(args) != 1: raise TypeError("vec.max() takes 1 argument (vec)")
+    return vector_max(_check_vector(args[0], 'max'))
+
+def native_vec_dot(args):
+    """Returns the dot product of two vectors of equal length."""
+    if len(args) != 2: raise TypeError("vec.dot() takes 2 arguments (vec, vec)")
+    return vector_dot(_check_vector(args[0], 'dot'), args[1])
@@ -1,5 +1,7 @@
 from dark_code.lexer import lex, Token
 from dark_code.parser import Parser
-from dark_code.interpreter import run, DarkClass, DarkInstance, Function, BoundMethod, ReturnSignal
+from dark_code.interpreter import run, Interpreter, Program, DarkClass, DarkInstance, Function, BoundMethod, ReturnSignal
 from dark_code.analyzer import StaticAnalyzer
+from dark_code.profiler import Profiler
+from dark_code.sampler import SamplingProfiler
 from dark_code.dark_exceptions import DarkSyntaxError, DarkRuntimeError, DarkError
\ No newline at end of file
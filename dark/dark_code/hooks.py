@@ -0,0 +1,97 @@
+import threading
+from dark_code.dark_exceptions import DarkRuntimeError
+
+HOOK_EVENTS = ('on_call', 'on_return', 'on_line', 'on_exception', 'on_native_call')
+
+
+class Hooks:
+    """
+    Реестр обработчиков трассировки интерпретатора:
+      on_call(func, args, call_site_line)   - перед выполнением тела функции Dark;
+      on_return(func, value)                - после нормального возврата из функции;
+      on_line(file, line, env)              - перед выполнением каждой инструкции;
+      on_exception(error, file, line)       - один раз для каждой ошибки, в инструкции, где она возникла;
+      on_native_call(func, args, line)      - перед вызовом нативной функции.
+    Обёртки wrap_*() подставляются в исполнитель только для событий, у которых есть обработчики.
+    Пока обработчик выполняется, события этого потока не генерируются, поэтому
+    обработчики на Dark не трассируют сами себя.
+    """
+    def __init__(self):
+        self.callbacks = {event: [] for event in HOOK_EVENTS}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def _check_event(self, event):
+        if event not in self.callbacks:
+            raise ValueError(f"unknown hook event '{event}', expected one of: {', '.join(HOOK_EVENTS)}")
+
+    def add(self, event, callback):
+        self._check_event(event)
+        with self.lock:
+            self.callbacks[event] = self.callbacks[event] + [callback]
+        return callback
+
+    def remove(self, event, callback):
+        self._check_event(event)
+        with self.lock:
+            self.callbacks[event] = [cb for cb in self.callbacks[event] if cb is not callback]
+
+    def clear(self, event=None):
+        with self.lock:
+            for name in ([event] if event else HOOK_EVENTS):
+                self._check_event(name)
+                self.callbacks[name] = []
+
+    def active(self, event):
+        return bool(self.callbacks[event])
+
+    def fire(self, event, *args):
+        callbacks = self.callbacks[event]
+        if not callbacks or getattr(self.local, 'running', False):
+            return
+        self.local.running = True
+        try:
+            for callback in callbacks:
+                callback(*args)
+        finally:
+            self.local.running = False
+
+    def wrap_function_body(self, run_function_body):
+        """Returns run_function_body that fires on_call and on_return."""
+        fire = self.fire
+
+        def hooked_function_body(func, args, call_site_line, self_instance):
+            fire('on_call', func, args, call_site_line)
+            value = run_function_body(func, args, call_site_line, self_instance)
+            fire('on_return', func, value)
+            return value
+
+        return hooked_function_body
+
+    def wrap_stmt(self, run_stmt):
+        """Returns run_stmt that fires on_line and, for the statement an error starts in, on_exception."""
+        fire = self.fire
+
+        def hooked_stmt(s, current_env):
+            fire('on_line', current_env.get('__file__', '<main>'), s[-1], current_env)
+            try:
+                return run_stmt(s, current_env)
+            except DarkRuntimeError as e:
+                if not getattr(e, 'hooks_notified', False):
+                    e.hooks_notified = True
+                    fire('on_exception', e, current_env.get('__file__', '<main>'), e.line or s[-1])
+                raise
+
+        return hooked_stmt
+
+    def wrap_call_value(self, call_value):
+        """Returns call_value that fires on_native_call before calling a native function."""
+        fire = self.fire
+
+        def hooked_call_value(func, args, line=None):
+            # Dark functions, methods and classes are not Python callables.
+            if callable(func):
+                fire('on_native_call', func, args, line)
+            return call_value(func, args, line)
+
+        return hooked_call_value
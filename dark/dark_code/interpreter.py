@@ -1,6 +1,19 @@
+import io
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict, deque
 from dark_code.native_modules import NATIVE_MODULES
+from dark_code.native_callbacks import bind_native_module
+from dark_code.metrics import METRICS, tag_native_module
+from dark_code.hooks import Hooks
+from dark_code.dark_extensions.dark_stdlib import DarkHeap, loop_range, native_stdlib_range
+from dark_code.dark_extensions.dark_bytes import DarkBuffer
+from dark_code.dark_extensions.dark_file import iter_lines
+from dark_code.dark_extensions.dark_tasks import DarkTask, await_value
+from dark_code.dark_extensions.dark_threads import DarkChannel, DarkThread
+from dark_code.dark_extensions.dark_vec import DarkVector, vector_binop, vector_sum, vector_mean, vector_min, vector_max, vector_dot, vector_slice, vector_copy
 from dark_code.dark_exceptions import DarkRuntimeError, DarkError
 from dark_code.lexer import lex
 from dark_code.parser import Parser
@@ -10,13 +23,20 @@ class DarkClass:
         self.name = name
         self.base_class = base_class
         self.methods = methods
+        self.method_cache = {}
 
     def find_method(self, name):
-        if name in self.methods:
-            return self.methods[name]
-        if self.base_class:
-            return self.base_class.find_method(name)
-        return None
+        # Classes are immutable once defined, so lookups through the base chain are cached;
+        # a racing thread can only store the same result again.
+        try:
+            return self.method_cache[name]
+        except KeyError:
+            pass
+        method = self.methods.get(name)
+        if method is None and self.base_class:
+            method = self.base_class.find_method(name)
+        self.method_cache[name] = method
+        return method
 
 class DarkInstance:
     def __init__(self, klass):
@@ -32,22 +52,187 @@ class BoundMethod:
         self.function = function
 
 class Function:
-    def __init__(self, name, params, body, definition_env):
+    def __init__(self, name, params, body, definition_env, is_async=False, line=None):
         self.name = name
         self.params = params
         self.body = body
         self.definition_env = definition_env
+        self.is_async = is_async
+        self.line = line
 
 class ReturnSignal(Exception):
     def __init__(self, value):
         self.value = value
 
 
-def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=None, modules=None, use_with_python=False, use_tkinter=True):
-    if env is None: env = {}
-    if script_dir is None: script_dir = '.'
-    if imported_files is None: imported_files = set()
-    if modules is None: modules = {}
+SET_ITEM_TYPES = (str, int, float, bool)
+# Errors that a statement turns into a DarkRuntimeError with its line.
+STATEMENT_ERRORS = (TypeError, NameError, RuntimeError, IndexError, KeyError, DarkRuntimeError)
+
+
+def dark_iter(value):
+    """
+    Возвращает итератор для цикла for или None, если объект не итерируемый.
+    Словари перебираются по снимку ключей, чтобы тело цикла могло их изменять,
+    а ленивые объекты (range, генераторы нативных модулей, файлы) не материализуются в список.
+    """
+    if isinstance(value, (list, str, range, set)):
+        return iter(value)
+    if isinstance(value, dict):
+        return iter(list(value.keys()))
+    if isinstance(value, (DarkClass, DarkInstance, Function, BoundMethod, DarkTask, DarkThread)):
+        return None
+    if isinstance(value, io.IOBase):
+        return iter_lines(value)
+    try:
+        return iter(value)
+    except TypeError:
+        return None
+
+
+def is_truthy(val):
+    """Истинность значения в условиях Dark: ложны false, 0, пустая строка и пустые коллекции."""
+    return not (val is False or val == 0 or val == "" or (isinstance(val, (list, dict, range, set, deque, DarkHeap, DarkVector, DarkBuffer)) and not val))
+
+
+COMPILE_CACHE_SIZE = 128
+
+
+class Program:
+    """Скомпилированная программа Dark, которую можно выполнять многократно в разных окружениях."""
+    def __init__(self, interpreter, ast, source_name, script_dir):
+        self.interpreter = interpreter
+        self.ast = ast
+        self.source_name = source_name
+        self.script_dir = script_dir
+
+    def execute(self, env=None):
+        return self.interpreter.execute_ast(self.ast, env, self.source_name, self.script_dir)
+
+
+class Interpreter:
+    """
+    Экземпляр интерпретатора для встраивания. Встроенные методы, замыкания исполнителя,
+    кэш модулей и кэш компиляции создаются один раз на экземпляр; разные экземпляры
+    не разделяют изменяемого состояния и могут работать в разных потоках одновременно.
+    """
+    def __init__(self, use_with_python=False, use_tkinter=True, modules=None, imported_files=None, profiler=None, hooks=None):
+        self.use_with_python = use_with_python
+        self.use_tkinter = use_tkinter
+        self.profiler = profiler
+        self.modules = {} if modules is None else modules
+        self.imported_files = set() if imported_files is None else imported_files
+        self.lock = threading.RLock()
+        self.compile_cache = OrderedDict()
+        self.native_names = {}
+        self.hooks = Hooks()
+        self._execute_ast, self.call_value, self._root, self._install_hooks = _make_runtime(self)
+        for event, callback in (hooks or {}).items():
+            self.add_hook(event, callback)
+
+    def add_hook(self, event, callback):
+        """Registers a tracing callback for on_call, on_return, on_line, on_exception or on_native_call; returns the callback."""
+        self.hooks.add(event, callback)
+        self._install_hooks()
+        return callback
+
+    def remove_hook(self, event, callback):
+        self.hooks.remove(event, callback)
+        self._install_hooks()
+
+    def clear_hooks(self, event=None):
+        self.hooks.clear(event)
+        self._install_hooks()
+
+    def fork(self):
+        """
+        Создаёт интерпретатор с теми же настройками, профайлером и обработчиками трассировки
+        для вызова функций Dark из другого потока. У копии свои замыкания исполнителя, блокировка
+        и кэш импорта (снимок уже загруженных модулей), поэтому импорты и обработчики трассировки
+        не пересекаются с исходным интерпретатором. Общими остаются значения: окружения загруженных
+        модулей, глобальные переменные, списки и словари, замкнутые в функциях, а также METRICS;
+        их изменение из нескольких потоков нужно защищать на уровне программы (например, каналами).
+        Нативные функции, импортированные исходным интерпретатором, вызывают колбэки через него.
+        """
+        child = Interpreter(self.use_with_python, self.use_tkinter, modules=dict(self.modules),
+                            imported_files=set(self.imported_files), profiler=self.profiler)
+        child.native_names.update(self.native_names)
+        child._root['env'] = self._root['env']
+        for event, callbacks in self.hooks.callbacks.items():
+            for callback in callbacks:
+                child.add_hook(event, callback)
+        return child
+
+    def native_name(self, func):
+        """Returns (module, name) of a native function imported by this interpreter, or ('', its Python name)."""
+        try:
+            return self.native_names[func]
+        except (KeyError, TypeError):
+            return '', getattr(func, '__name__', '')
+
+    def compile(self, source, source_name='<string>', script_dir=None):
+        """Parses source once (cached by text) and returns a Program; raises DarkSyntaxError on the first syntax error."""
+        with self.lock:
+            ast = self.compile_cache.get(source)
+            if ast is not None:
+                self.compile_cache.move_to_end(source)
+                METRICS.compile_hits += 1
+        if ast is None:
+            METRICS.compile_misses += 1
+            parser = Parser(lex(source))
+            ast = parser.parse()
+            if parser.errors:
+                error = parser.errors[0]
+                if os.path.exists(source_name):
+                    error.filename = os.path.abspath(source_name)
+                raise error
+            with self.lock:
+                self.compile_cache[source] = ast
+                while len(self.compile_cache) > COMPILE_CACHE_SIZE:
+                    self.compile_cache.popitem(last=False)
+        if script_dir is None:
+            script_dir = os.path.dirname(os.path.abspath(source_name)) if os.path.exists(source_name) else '.'
+        return Program(self, ast, source_name, script_dir)
+
+    def execute_ast(self, ast, env=None, source_name='<string>', script_dir=None):
+        """Runs a parsed program in env (a new one by default); returns the env or the value of a top-level return."""
+        if env is None: env = {}
+        if script_dir is None: script_dir = '.'
+        if self.use_with_python:
+            from dark_code.native_modules import native_python_exec
+            self.modules['python'] = {'exec': lambda args: native_python_exec(args, env)}
+        self._root['env'] = env
+        run_token = METRICS.begin_run()
+        try:
+            return self._execute_ast(ast, env, source_name, script_dir)
+        finally:
+            METRICS.end_run(run_token)
+
+
+def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=None, modules=None, use_with_python=False, use_tkinter=True, profiler=None, hooks=None):
+    interpreter = Interpreter(use_with_python=use_with_python, use_tkinter=use_tkinter, modules=modules, imported_files=imported_files, profiler=profiler, hooks=hooks)
+    return interpreter.execute_ast(ast, env, source_name, script_dir)
+
+
+def _make_runtime(interpreter):
+    """
+    Создаёт замыкания исполнителя (eval_expr, run_stmt, call_value и др.) для экземпляра Interpreter.
+    Возвращает (execute_ast, call_value, root, install_hooks), где root['env'] - окружение
+    выполняемой программы, а install_hooks() переключает исполнитель на обёртки Hooks и обратно.
+    """
+    modules = interpreter.modules
+    imported_files = interpreter.imported_files
+    use_tkinter = interpreter.use_tkinter
+    import_lock = interpreter.lock
+    native_names = interpreter.native_names
+    native_name = interpreter.native_name
+    caller_epoch = object()
+    loading_modules = {}
+    waiting_threads = {}
+    script_dirs = {}
+    root = {'env': {}}
+    metrics = METRICS
+    perf_counter = time.perf_counter
 
     BUILTIN_METHODS = {
         str: {
@@ -63,16 +248,108 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
             'len':    (0, lambda o, a: len(o)),
             'append': (1, lambda o, a: o.append(a[0]) or 0),
             'pop':    (0, lambda o, a: o.pop()),
+            'sort':    ((0, 1), lambda o, a: _list_sort(o, a)),
+            'reverse': (0, lambda o, a: o.reverse() or 0),
+            'extend':  (1, lambda o, a: _list_extend(o, a[0])),
+            'slice':   (2, lambda o, a: o[a[0]:a[1]]),
+            'sum':     (0, lambda o, a: sum(o)),
+            'min':     (0, lambda o, a: _list_extremum(o, min, 'min')),
+            'max':     (0, lambda o, a: _list_extremum(o, max, 'max')),
+            'map':     (1, lambda o, a: list(map(make_fast_caller(a[0]), o))),
+            'filter':  (1, lambda o, a: _list_filter(o, a)),
+            'reduce':  ((1, 2), lambda o, a: _list_reduce(o, a)),
         },
         dict: {
             'len':  (0, lambda o, a: len(o)),
             'keys': (0, lambda o, a: list(o.keys())),
-        }
+        },
+        set: {
+            'len':          (0, lambda o, a: len(o)),
+            'add':          (1, lambda o, a: o.add(_check_set_item(a[0])) or 0),
+            'remove':       (1, lambda o, a: _set_remove(o, a[0])),
+            'discard':      (1, lambda o, a: o.discard(a[0]) or 0),
+            'contains':     (1, lambda o, a: a[0] in o),
+            'union':        (1, lambda o, a: o.union(_as_set_operand(a[0]))),
+            'intersection': (1, lambda o, a: o.intersection(_as_set_operand(a[0]))),
+            'difference':   (1, lambda o, a: o.difference(_as_set_operand(a[0]))),
+            'is_subset':    (1, lambda o, a: o.issubset(_as_set_operand(a[0]))),
+            'to_list':      (0, lambda o, a: list(o)),
+        },
+        deque: {
+            'len':         (0, lambda o, a: len(o)),
+            'append':      (1, lambda o, a: o.append(a[0]) or 0),
+            'append_left': (1, lambda o, a: o.appendleft(a[0]) or 0),
+            'pop':         (0, lambda o, a: o.pop()),
+            'pop_left':    (0, lambda o, a: o.popleft()),
+            'peek':        (0, lambda o, a: o[-1]),
+            'peek_left':   (0, lambda o, a: o[0]),
+            'rotate':      (1, lambda o, a: o.rotate(a[0]) or 0),
+            'clear':       (0, lambda o, a: o.clear() or 0),
+            'to_list':     (0, lambda o, a: list(o)),
+        },
+        DarkHeap: {
+            'len':           (0, lambda o, a: len(o)),
+            'push':          (1, lambda o, a: _heap_push(o, a[0])),
+            'push_priority': (2, lambda o, a: o.push(a[0], a[1]) or 0),
+            'pop':           (0, lambda o, a: o.pop()),
+            'peek':          (0, lambda o, a: o.peek()),
+            'clear':         (0, lambda o, a: o.clear() or 0),
+            'to_list':       (0, lambda o, a: list(o)),
+        },
+        DarkVector: {
+            'len':     (0, lambda o, a: len(o)),
+            'sum':     (0, lambda o, a: vector_sum(o)),
+            'mean':    (0, lambda o, a: vector_mean(o)),
+            'min':     (0, lambda o, a: vector_min(o)),
+            'max':     (0, lambda o, a: vector_max(o)),
+            'dot':     (1, lambda o, a: vector_dot(o, a[0])),
+            'slice':   (2, lambda o, a: vector_slice(o, a[0], a[1])),
+            'copy':    (0, lambda o, a: vector_copy(o)),
+            'to_list': (0, lambda o, a: o.data.tolist()),
+        },
+        DarkBuffer: {
+            'len':     (0, lambda o, a: len(o)),
+            'slice':   (2, lambda o, a: o.slice(a[0], a[1])),
+            'find':    ((1, 2), lambda o, a: o.find(*a)),
+            'decode':  ((0, 1), lambda o, a: o.decode(*a)),
+            'to_list': (0, lambda o, a: list(o)),
+            'close':   (0, lambda o, a: o.close() or 0),
+        },
+        DarkChannel: {
+            'send':  (1, lambda o, a: o.send(a[0])),
+            'recv':  ((0, 1), lambda o, a: o.recv(*a)),
+            'close': (0, lambda o, a: o.close()),
+            'len':   (0, lambda o, a: len(o)),
+        },
+        DarkThread: {
+            'join':     ((0, 1), lambda o, a: o.join(*a)),
+            'is_alive': (0, lambda o, a: o.is_alive()),
+        },
+        range: {
+            'len':      (0, lambda o, a: len(o)),
+            'contains': (1, lambda o, a: a[0] in o),
+            'to_list':  (0, lambda o, a: list(o)),
+        },
     }
-    
-    if use_with_python:
-        from dark_code.native_modules import native_python_exec
-        modules['python'] = {'exec': lambda args: native_python_exec(args, env)}
+
+    def _check_set_item(item):
+        if not isinstance(item, SET_ITEM_TYPES):
+            raise DarkRuntimeError(f"недопустимый тип элемента множества: '{type(item).__name__}'")
+        return item
+
+    def _set_remove(s, item):
+        if item not in s:
+            raise DarkRuntimeError(f"элемент '{item}' не найден в множестве")
+        s.remove(item)
+        return 0
+
+    def _as_set_operand(other):
+        if isinstance(other, (set, dict)):
+            return other
+        items = dark_iter(other)
+        if items is None:
+            raise DarkRuntimeError(f"объект типа '{type(other).__name__}' нельзя использовать как множество")
+        return {_check_set_item(item) for item in items}
 
     def _dark_obj_to_str(val, current_env):
         """Преобразует объект Dark в строку, вызывая __str__ если он есть."""
@@ -88,19 +365,23 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
                 except DarkRuntimeError as e:
                     raise e
             return str(val) 
+        if isinstance(val, range):
+            return f"irange({val.start}, {val.stop}, {val.step})"
         return str(val)
 
-    def is_truthy(val):
-        return not (val is False or val == 0 or val == "" or (isinstance(val, (list, dict)) and not val)) 
-
     def call_dark_function(func, args, call_site_line=None, self_instance=None):
         if len(args) != len(func.params):
             raise DarkRuntimeError(f"Function '{func.name}' expects {len(func.params)} arguments, got {len(args)}", line=call_site_line)
+        if func.is_async:
+            return DarkTask(func.name, lambda: run_function_body(func, args, call_site_line, self_instance))
+        return run_function_body(func, args, call_site_line, self_instance)
 
+    def run_function_body(func, args, call_site_line, self_instance):
+        metrics.calls += 1
         call_env = dict(func.definition_env)
         
-        if '__current_self__' in env:
-            call_env['__current_self__'] = env['__current_self__']
+        if '__current_self__' in root['env']:
+            call_env['__current_self__'] = root['env']['__current_self__']
         if self_instance:
             call_env['__current_self__'] = self_instance
         for param_name, arg_val in zip(func.params, args):
@@ -119,6 +400,143 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
             raise e
         return 0 
 
+    def call_value(func, args, line=None):
+        """Вызывает любое вызываемое значение Dark: функцию, метод, класс или нативную функцию."""
+        if isinstance(func, BoundMethod):
+            method_args = [func.instance] + args
+            return call_dark_function(func.function, method_args, line, self_instance=func.instance)
+
+        if isinstance(func, DarkClass):
+            instance = DarkInstance(func)
+            metrics.record_instance(func.name)
+            constructor = func.find_method('__main__')
+            if constructor:
+                constructor_args = [instance] + args
+                call_dark_function(constructor, constructor_args, line, self_instance=instance)
+            elif args:
+                raise DarkRuntimeError(f"Class '{func.name}' does not have a constructor to accept arguments.", line=line)
+            return instance
+
+        if isinstance(func, Function):
+            return call_dark_function(func, args, line)
+
+        if callable(func):
+            started = perf_counter()
+            try:
+                return func(args)
+            except TypeError as e:
+                raise DarkRuntimeError(f"ошибка вызова нативной функции: {e}", line=line) from e
+            finally:
+                metrics.record_native(native_name(func)[0] or '<native>', perf_counter() - started)
+
+        raise DarkRuntimeError(f"объект не является функцией и не может быть вызван", line=line)
+
+    def statement_error(e, line):
+        """
+        Приводит ошибку, возникшую в инструкции на строке line, к DarkRuntimeError:
+        ошибки Python оборачиваются, строка проставляется, если её ещё нет.
+        """
+        if not isinstance(e, DarkRuntimeError):
+            e = DarkRuntimeError(str(e), line=line)
+        # An error passes through every enclosing statement; only the innermost one counts it.
+        if not e.counted:
+            e.counted = True
+            metrics.errors_raised += 1
+        e.line = e.line or line
+        return e
+
+    def make_fast_caller(func, line=None):
+        """
+        Возвращает Python-функцию для многократного вызова функции Dark из нативного кода
+        (sort, map, filter, reduce). Проверки и подготовка окружения выполняются один раз,
+        а тело вида `return <выражение>` вычисляется напрямую, без ReturnSignal.
+        """
+        if not isinstance(func, Function) or func.is_async:
+            return lambda *args: call_value(func, list(args), line)
+
+        params = func.params
+        body = func.body
+        base_env = func.definition_env
+        if '__current_self__' in root['env']:
+            base_env = dict(base_env)
+            base_env['__current_self__'] = root['env']['__current_self__']
+        single_return = None
+        if len(body) == 1 and body[0][0] == 'return' and body[0][1]:
+            single_return = body[0]
+
+        def fast_call(*args):
+            if len(args) != len(params):
+                raise DarkRuntimeError(f"Function '{func.name}' expects {len(params)} arguments, got {len(args)}", line=line)
+            metrics.calls += 1
+            call_env = dict(base_env)
+            call_env.update(zip(params, args))
+            try:
+                if single_return is not None:
+                    metrics.statements += 1
+                    try:
+                        return eval_expr(single_return[1], call_env)
+                    except STATEMENT_ERRORS as e:
+                        raise statement_error(e, single_return[2])
+                for stmt_node in body:
+                    run_stmt(stmt_node, call_env)
+            except ReturnSignal as ret:
+                return ret.value
+            except DarkRuntimeError as e:
+                e.add_trace(base_env.get('__file__', '<unknown>'), line, f"функция '{func.name}'")
+                raise e
+            return 0
+
+        return fast_call
+
+    def _heap_push(heap, item):
+        priority = item
+        if heap.key is not None:
+            # The cached caller is rebuilt after install_hooks() swaps make_fast_caller,
+            # and when the heap is used by another interpreter.
+            if heap.key_caller_epoch is not caller_epoch:
+                heap.key_caller = make_fast_caller(heap.key)
+                heap.key_caller_epoch = caller_epoch
+            priority = heap.key_caller(item)
+        heap.push(item, priority)
+        return 0
+
+    def _list_sort(lst, args):
+        if args:
+            lst.sort(key=make_fast_caller(args[0]))
+        else:
+            lst.sort()
+        return 0
+
+    def _list_extremum(lst, pick, name):
+        if not lst:
+            raise DarkRuntimeError(f"list.{name}() вызван для пустого списка")
+        return pick(lst)
+
+    def _list_filter(lst, args):
+        predicate = make_fast_caller(args[0])
+        return [item for item in lst if is_truthy(predicate(item))]
+
+    def _list_reduce(lst, args):
+        reducer = make_fast_caller(args[0])
+        items = iter(lst)
+        if len(args) == 2:
+            acc = args[1]
+        else:
+            try:
+                acc = next(items)
+            except StopIteration:
+                raise DarkRuntimeError("list.reduce() вызван для пустого списка без начального значения")
+        for item in items:
+            acc = reducer(acc, item)
+        return acc
+
+    def _list_extend(lst, other):
+        items = dark_iter(other)
+        if items is None:
+            raise DarkRuntimeError(f"объект типа '{type(other).__name__}' не является итерируемым")
+        lst.extend(items)
+        return 0
+
     def eval_expr(node, current_env):
         t = node[0]
         line = node[-1] if isinstance(node[-1], int) else None
@@ -135,6 +553,8 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
             if op == '-':
                 return -val
             return val 
+        if t == 'await':
+            return await_value(eval_expr(node[1], current_env), node[2])
         if t == 'input':
             try:
                 return input()
@@ -159,7 +579,16 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
             if isinstance(val, bool): return "bool"
             if isinstance(val, list): return "list"
             if isinstance(val, dict): return "dict"
+            if isinstance(val, range): return "range"
+            if isinstance(val, set): return "set"
+            if isinstance(val, deque): return "deque"
+            if isinstance(val, DarkHeap): return "heap"
+            if isinstance(val, DarkVector): return "vec"
+            if isinstance(val, DarkBuffer): return "bytes"
             if isinstance(val, Function): return "function"
+            if isinstance(val, DarkTask): return "task"
+            if isinstance(val, DarkChannel): return "channel"
+            if isinstance(val, DarkThread): return "thread"
             return "unknown"
         if t == 'bool':
             return node[1]
@@ -169,6 +598,8 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
             return node[1]
         if t == 'list':
             return [eval_expr(elem, current_env) for elem in node[1]]
+        if t == 'set':
+            return {_check_set_item(eval_expr(elem, current_env)) for elem in node[1]}
         if t == 'dict':
             d = {}
             for k_node, v_node in node[1]:
@@ -265,6 +696,9 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
                 if rmethod:
                     return call_dark_function(rmethod, [b, a], call_site_line=line, self_instance=b)
 
+
+            if isinstance(a, DarkVector) or isinstance(b, DarkVector):
+                return vector_binop(op, a, b, line)
             
             if op == '==':
                 return a == b
@@ -305,7 +739,7 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
             collection_node, index_node, line = node[1], node[2], node[3]
             collection = eval_expr(collection_node, current_env)
             index = eval_expr(index_node, current_env)
-            if isinstance(collection, (list, str, dict)):
+            if isinstance(collection, (list, str, dict, range, deque, DarkVector, DarkBuffer)):
                 try:
                     return collection[index]
                 except IndexError:
@@ -332,8 +766,13 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
 
                 if obj_type in BUILTIN_METHODS and method_name in BUILTIN_METHODS[obj_type]:
                     expected_argc, func_lambda = BUILTIN_METHODS[obj_type][method_name]
-                    if len(args) != expected_argc:
+                    if isinstance(expected_argc, tuple):
+                        min_argc, max_argc = expected_argc
+                        if not min_argc <= len(args) <= max_argc:
+                            raise DarkRuntimeError(f"метод {obj_type.__name__}.{method_name}() принимает от {min_argc} до {max_argc} аргументов, но было передано {len(args)}", line=line)
+                    elif len(args) != expected_argc:
                         raise DarkRuntimeError(f"метод {obj_type.__name__}.{method_name}() принимает {expected_argc} аргументов, но было передано {len(args)}", line=line)
+                    metrics.builtin_calls += 1
                     try:
                         return func_lambda(obj, args)
                     except IndexError:
@@ -343,37 +782,152 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
             func = eval_expr(callable_node, current_env)
 
 
-            if isinstance(func, BoundMethod):
-                if func.function.name.startswith('__'):
-                    current_self = current_env.get('__current_self__')
-                    if current_self is not func.instance:
-                        raise DarkRuntimeError(f"не удается вызвать приватный метод '{func.function.name}' объекта '{func.instance.klass.name}'", line=line)
-
-                method_args = [func.instance] + args
-                return call_dark_function(func.function, method_args, line, self_instance=func.instance)
-
-            if isinstance(func, DarkClass):
-                instance = DarkInstance(func)
-                constructor = func.find_method('__main__')
-                if constructor:
-                    constructor_args = [instance] + args
-                    call_dark_function(constructor, constructor_args, line, self_instance=instance)
-                elif args:
-                    raise DarkRuntimeError(f"Class '{func.name}' does not have a constructor to accept arguments.", line=line)
-                return instance
-
-            if isinstance(func, Function):
-                return call_dark_function(func, args, line)
+            if isinstance(func, BoundMethod) and func.function.name.startswith('__'):
+                current_self = current_env.get('__current_self__')
+                if current_self is not func.instance:
+                    raise DarkRuntimeError(f"не удается вызвать приватный метод '{func.function.name}' объекта '{func.instance.klass.name}'", line=line)
+
+            return call_value(func, args, line)
+
+    def eval_loop_iterable(node, current_env):
+        """
+        Вычисляет выражение после in в цикле for. Вызов вида module.range(...), где module -
+        переменная со стандартным модулем stdlib, выполняется лениво: список, который вернул бы
+        stdlib.range, в цикле не виден, поэтому его не нужно создавать.
+        """
+        if node[0] == 'func_call' and node[1][0] == 'member_access' and node[1][2] == 'range' and node[1][1][0] == 'var':
+            module = eval_expr(node[1][1], current_env)
+            if isinstance(module, dict) and module.get('range') is native_stdlib_range:
+                args = [eval_expr(arg, current_env) for arg in node[2]]
+                return call_value(loop_range, args, node[3])
+        return eval_expr(node, current_env)
+
+    def script_dir_of(current_env):
+        file_name = current_env.get('__file__')
+        if file_name in script_dirs:
+            return script_dirs[file_name]
+        return os.path.dirname(file_name) if file_name and file_name != '<main>' else '.'
+
+    def import_module(module_name, current_env, line):
+        """
+        Выполняет import: нативный модуль, Python-расширение или файл .dark относительно импортирующего файла.
+        Общая блокировка удерживается только на время поиска и регистрации модуля: файл .dark
+        выполняется без неё, поэтому модуль может запускать потоки, которые сами импортируют модули.
+        """
+        with import_lock:
+            pending = loading_modules.get(module_name)
+            if pending is None:
+                load = find_module(module_name, current_env, line)
+        if pending is not None:
+            wait_for_module(module_name, pending)
+        elif load is not None:
+            load()
+
+    def wait_for_module(module_name, pending):
+        # Like CPython's per-module import locks: other threads wait until the module finishes
+        # executing, while a circular import (in the same thread or through threads that wait
+        # on each other) gets the partially initialized module instead of deadlocking.
+        done, owner = pending
+        me = threading.get_ident()
+        with import_lock:
+            blocker = owner
+            while blocker != me:
+                blocked_on = waiting_threads.get(blocker)
+                if blocked_on is None or blocked_on not in loading_modules:
+                    break
+                blocker = loading_modules[blocked_on][1]
+            if blocker == me:
+                return
+            waiting_threads[me] = module_name
+        try:
+            done.wait()
+        finally:
+            with import_lock:
+                waiting_threads.pop(me, None)
+
+    def find_module(module_name, current_env, line):
+        """Registers the module under import_lock; for a .dark file returns a function that executes it, otherwise None."""
+        if module_name in modules:
+            return None
+        script_dir = script_dir_of(current_env)
+
+        if module_name in NATIVE_MODULES:
+            modules[module_name] = bind_native_module(NATIVE_MODULES[module_name], call_value, interpreter)
+            tag_native_module(native_names, module_name, modules[module_name])
+            return None
+
+        
+        py_ext_path = None
+        search_dir = script_dir
+        while True:
+            potential_ext_dir = os.path.join(search_dir, 'dark_extensions')
+            potential_py_path = os.path.join(potential_ext_dir, module_name + ".py")
+            if os.path.exists(potential_py_path):
+                py_ext_path = potential_py_path
+                break
             
-            if callable(func): 
+            parent_dir = os.path.dirname(search_dir)
+            if parent_dir == search_dir: 
+                break
+            search_dir = parent_dir
+
+        if py_ext_path:
+            try:
+                ext_dir = os.path.dirname(py_ext_path)
+                if ext_dir not in sys.path:
+                    sys.path.insert(0, ext_dir)
+                
+                py_module = __import__(module_name)
+                
+                if hasattr(py_module, 'get_module') and callable(py_module.get_module):
+                    modules[module_name] = py_module.get_module(use_tkinter=use_tkinter)
+                    tag_native_module(native_names, module_name, modules[module_name])
+                    return None
+                else:
+                    raise DarkRuntimeError(f"Python extension '{module_name}' does not have a callable 'get_module' function.", line=line)
+            except ImportError as e:
+                raise DarkRuntimeError(f"Failed to import Python extension '{module_name}': {e}", line=line)
+            except Exception as e:
+                raise DarkRuntimeError(f"Error loading Python extension '{module_name}': {e}", line=line)
+
+        
+        module_path = os.path.join(script_dir, module_name + ".dark")
+        canonical_path = os.path.abspath(module_path)
+
+        if not os.path.exists(canonical_path):
+            raise DarkRuntimeError(f"не удалось найти модуль или Python-расширение: {module_name}", line=line)
+        if canonical_path in imported_files:
+            return None
+        imported_files.add(canonical_path)
+
+        # The placeholder module is visible before the file runs, as in sys.modules.
+        module_env = {'__file__': canonical_path}
+        modules[module_name] = module_env
+        done = threading.Event()
+        loading_modules[module_name] = (done, threading.get_ident())
+
+        def load():
+            try:
+                with open(canonical_path, 'r', encoding='utf-8') as f:
+                    src = f.read()
                 try:
-                    return func(args)
-                except TypeError as e:
-                    raise DarkRuntimeError(f"ошибка вызова нативной функции: {e}", line=line) from e
+                    tokens = lex(src)
+                    module_ast = Parser(tokens).parse()
+                    module_dir = os.path.dirname(canonical_path)
+                    execute_ast(module_ast, module_env, canonical_path, module_dir)
+                except DarkError as e:
+                    error = DarkRuntimeError(f"Error in module '{module_name}' ({canonical_path}):\n{e}", line=line)
+                    error.counted = isinstance(e, DarkRuntimeError)
+                    raise error
+            finally:
+                with import_lock:
+                    del loading_modules[module_name]
+                done.set()
 
-            raise DarkRuntimeError(f"объект не является функцией и не может быть вызван", line=line)
+        return load
 
     def run_stmt(s, current_env):
+        metrics.statements += 1
         line = s[-1]
         try:
             typ = s[0]
@@ -384,75 +938,10 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
                 values = [_dark_obj_to_str(eval_expr(arg, current_env), current_env) for arg in s[1]]
                 print(*values)
             elif typ == 'import':
-                module_name = s[1]
-                if module_name in modules:
-                    return 
-
-                if module_name in NATIVE_MODULES:
-                    modules[module_name] = NATIVE_MODULES[module_name]
-                    return
-
-                
-                py_ext_path = None
-                search_dir = script_dir
-                while True:
-                    potential_ext_dir = os.path.join(search_dir, 'dark_extensions')
-                    potential_py_path = os.path.join(potential_ext_dir, module_name + ".py")
-                    if os.path.exists(potential_py_path):
-                        py_ext_path = potential_py_path
-                        break
-                    
-                    parent_dir = os.path.dirname(search_dir)
-                    if parent_dir == search_dir: 
-                        break
-                    search_dir = parent_dir
-
-                if py_ext_path:
-                    try:
-                        ext_dir = os.path.dirname(py_ext_path)
-                        if ext_dir not in sys.path:
-                            sys.path.insert(0, ext_dir)
-                        
-                        py_module = __import__(module_name)
-                        
-                        if hasattr(py_module, 'get_module') and callable(py_module.get_module):
-                            modules[module_name] = py_module.get_module(use_tkinter=use_tkinter)
-                            return
-                        else:
-                            raise DarkRuntimeError(f"Python extension '{module_name}' does not have a callable 'get_module' function.", line=line)
-                    except ImportError as e:
-                        raise DarkRuntimeError(f"Failed to import Python extension '{module_name}': {e}", line=line)
-                    except Exception as e:
-                        raise DarkRuntimeError(f"Error loading Python extension '{module_name}': {e}", line=line)
-
-                
-                module_path = os.path.join(script_dir, module_name + ".dark")
-                canonical_path = os.path.abspath(module_path)
-
-                if not os.path.exists(canonical_path):
-                    raise DarkRuntimeError(f"не удалось найти модуль или Python-расширение: {module_name}", line=line)
-                else:
-                    if canonical_path in imported_files:
-                        return
-
-                    imported_files.add(canonical_path)
-
-                    with open(canonical_path, 'r', encoding='utf-8') as f:
-                        src = f.read()
-                    try:
-                        tokens = lex(src)
-                        module_ast = Parser(tokens).parse()
-                        module_dir = os.path.dirname(canonical_path)
-                        module_env = {}
-                        modules[module_name] = module_env
-                        module_env['__file__'] = canonical_path 
-                        
-                        run(module_ast, env=module_env, script_dir=module_dir, imported_files=imported_files, modules=modules, use_with_python=use_with_python)
-                    except DarkError as e:
-                        raise DarkRuntimeError(f"Error in module '{module_name}' ({canonical_path}):\n{e}", line=line)
-            elif typ == 'func_def':
+                import_module(s[1], current_env, line)
+            elif typ in ('func_def', 'async_func_def'):
                 name, params, body = s[1], s[2], s[3]
-                func = Function(name, params, body, dict(current_env))
+                func = Function(name, params, body, dict(current_env), is_async=typ == 'async_func_def', line=line)
                 func.definition_env['__file__'] = current_env.get('__file__', '<main>')
                 current_env[name] = func 
                 func.definition_env[name] = func 
@@ -467,12 +956,12 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
 
                 methods = {}
                 for method_node in method_nodes:
-                    if method_node[0] != 'func_def':
+                    if method_node[0] not in ('func_def', 'async_func_def'):
                         raise DarkRuntimeError("Only functions can be defined in a class.", line=method_node[4])
                     func_name, params, body, _ = method_node[1], method_node[2], method_node[3], method_node[4]
                     if not params:
                         raise DarkRuntimeError(f"Method '{func_name}' must have at least one parameter for the instance.", line=method_node[4])
-                    method_func = Function(func_name, params, body, dict(current_env))
+                    method_func = Function(func_name, params, body, dict(current_env), is_async=method_node[0] == 'async_func_def', line=method_node[4])
                     method_func.definition_env['__file__'] = current_env.get('__file__', '<main>')
                     methods[func_name] = method_func
 
@@ -508,8 +997,8 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
                 collection = eval_expr(collection_node, current_env)
                 index = eval_expr(index_node, current_env)
                 value = eval_expr(value_node, current_env)
-                if isinstance(collection, (list, dict)):
-                    if isinstance(collection, list):
+                if isinstance(collection, (list, dict, DarkVector, DarkBuffer)):
+                    if isinstance(collection, (list, DarkVector, DarkBuffer)):
                         if not isinstance(index, int):
                             raise DarkRuntimeError(f"индексы списка должны быть целыми числами, а не '{type(index).__name__}'", line=line)
                         if index < -len(collection) or index >= len(collection):
@@ -538,14 +1027,11 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
                     for st in s[2]: run_stmt(st, current_env)
             elif typ == 'for':
                 var_name, iterable_expr, body = s[1], s[2], s[3]
-                iterable = eval_expr(iterable_expr, current_env)
-                
-                if not isinstance(iterable, (list, str, dict)):
-                     raise DarkRuntimeError(f"объект типа '{type(iterable).__name__}' не является итерируемым", line=line)
+                iterable = eval_loop_iterable(iterable_expr, current_env)
 
-                items_to_iterate = iterable
-                if isinstance(iterable, dict):
-                    items_to_iterate = list(iterable.keys())
+                items_to_iterate = dark_iter(iterable)
+                if items_to_iterate is None:
+                     raise DarkRuntimeError(f"объект типа '{type(iterable).__name__}' не является итерируемым", line=line)
 
                 for item in items_to_iterate:
                     current_env[var_name] = item
@@ -559,9 +1045,7 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
                     for stmt_node in try_body:
                         run_stmt(stmt_node, current_env)
                 except DarkRuntimeError as e:
-                    
-                    
-                    
+                    metrics.errors_caught += 1
                     except_env = dict(current_env)
                     original_value = None
                     had_original_value = False
@@ -586,17 +1070,43 @@ def run(ast, env=None, source_name='<string>', script_dir=None, imported_files=N
                                 pass
                             else:
                                 pass
-        except (TypeError, NameError, RuntimeError, IndexError, KeyError, DarkRuntimeError) as e:
-            if isinstance(e, DarkRuntimeError):
-                e.line = e.line or line
-                raise e
-            raise DarkRuntimeError(str(e), line=line)
+        except STATEMENT_ERRORS as e:
+            raise statement_error(e, line)
 
-    try:
+    def execute_ast(ast, env, source_name, script_dir):
         if '__file__' not in env:
             env['__file__'] = os.path.abspath(source_name)
-        for st in ast[1]:
-            run_stmt(st, env)
-    except ReturnSignal as e:
-        return e.value
-    return env
\ No newline at end of file
+        script_dirs[env['__file__']] = script_dir
+        try:
+            for st in ast[1]:
+                run_stmt(st, env)
+        except ReturnSignal as e:
+            return e.value
+        return env
+
+    def slow_caller(func, line=None):
+        return lambda *args: call_value(func, list(args), line)
+
+    profiler = interpreter.profiler
+    if profiler is not None:
+        # Closures reach these functions through their cells, so rebinding here instruments
+        # every call site; fast callers are routed through call_value so they are measured too.
+        run_function_body = profiler.wrap_call(run_function_body)
+        run_stmt = profiler.wrap_stmt(run_stmt)
+        make_fast_caller = slow_caller
+
+    plain_run_stmt, plain_run_function_body, plain_call_value, plain_make_fast_caller = run_stmt, run_function_body, call_value, make_fast_caller
+
+    def install_hooks():
+        """Rebinds the executor to hook-firing wrappers for the events that have callbacks, and back to the plain functions when none do."""
+        nonlocal run_stmt, run_function_body, call_value, make_fast_caller, caller_epoch
+        hooks = interpreter.hooks
+        traced_calls = hooks.active('on_call') or hooks.active('on_return')
+        traced_lines = hooks.active('on_line') or hooks.active('on_exception')
+        run_function_body = hooks.wrap_function_body(plain_run_function_body) if traced_calls else plain_run_function_body
+        run_stmt = hooks.wrap_stmt(plain_run_stmt) if traced_lines else plain_run_stmt
+        call_value = hooks.wrap_call_value(plain_call_value) if hooks.active('on_native_call') else plain_call_value
+        make_fast_caller = slow_caller if traced_calls or traced_lines else plain_make_fast_caller
+        caller_epoch = object()
+
+    return execute_ast, plain_call_value, root, install_hooks
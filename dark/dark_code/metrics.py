@@ -0,0 +1,130 @@
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+METRICS_ENV = 'DARK_METRICS'
+
+
+class RuntimeMetrics:
+    """
+    Постоянно включённые счётчики исполнителя для мониторинга: инструкции, вызовы функций Dark,
+    нативные вызовы по модулям, вызовы встроенных методов (list.append, str.upper и т.п.),
+    созданные экземпляры по классам, ошибки, кэш компиляции и время. Встроенные методы
+    только считаются: их время входит во время интерпретации, а не нативных модулей.
+    Счётчики увеличиваются без блокировки, чтобы не замедлять исполнитель; при работе
+    нескольких потоков отдельные инкременты могут теряться. Время нативных вызовов
+    включает ожидание внутри них и обратные вызовы в Dark.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active_runs = {}
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.statements = 0
+            self.calls = 0
+            self.builtin_calls = 0
+            self.native_calls = {}
+            self.instances = {}
+            self.errors_raised = 0
+            self.errors_caught = 0
+            self.compile_hits = 0
+            self.compile_misses = 0
+            self.run_time = 0.0
+            self.reset_at = time.perf_counter()
+
+    def begin_run(self):
+        token = object()
+        with self.lock:
+            self.active_runs[token] = time.perf_counter()
+        return token
+
+    def end_run(self, token):
+        with self.lock:
+            started = self.active_runs.pop(token)
+            self.run_time += time.perf_counter() - max(started, self.reset_at)
+
+    def record_native(self, module_name, elapsed):
+        stats = self.native_calls.get(module_name)
+        if stats is None:
+            stats = self.native_calls[module_name] = [0, 0.0]
+        stats[0] += 1
+        stats[1] += elapsed
+
+    def record_instance(self, class_name):
+        self.instances[class_name] = self.instances.get(class_name, 0) + 1
+
+    def snapshot(self):
+        native_time = sum(spent for _, spent in list(self.native_calls.values()))
+        now = time.perf_counter()
+        with self.lock:
+            run_time = self.run_time + sum(now - max(started, self.reset_at) for started in self.active_runs.values())
+        return {
+            'uptime': time.time() - self.started,
+            'statements': self.statements,
+            'calls': self.calls,
+            'builtin_method_calls': self.builtin_calls,
+            'native_calls': {name: {'calls': calls, 'time': spent} for name, (calls, spent) in list(self.native_calls.items())},
+            'instances': dict(self.instances),
+            'errors_raised': self.errors_raised,
+            'errors_caught': self.errors_caught,
+            'compile_cache_hits': self.compile_hits,
+            'compile_cache_misses': self.compile_misses,
+            'run_time': run_time,
+            'native_time': native_time,
+            'interpret_time': max(run_time - native_time, 0.0),
+        }
+
+    def format_report(self):
+        data = self.snapshot()
+        lines = [
+            f"Метрики исполнителя Dark за {data['uptime']:.3f} с",
+            f"  инструкций выполнено:    {data['statements']}",
+            f"  вызовов функций Dark:    {data['calls']}",
+            f"  встроенных методов:      {data['builtin_method_calls']} (время входит в интерпретацию)",
+            f"  ошибок возбуждено/поймано: {data['errors_raised']}/{data['errors_caught']}",
+            f"  кэш компиляции:          {data['compile_cache_hits']} попаданий, {data['compile_cache_misses']} промахов",
+            f"  время выполнения:        {data['run_time']:.4f} с (интерпретация {data['interpret_time']:.4f} с, нативные модули {data['native_time']:.4f} с)",
+        ]
+        if data['native_calls']:
+            lines.append("  нативные вызовы по модулям:")
+            for name, stats in sorted(data['native_calls'].items(), key=lambda item: item[1]['calls'], reverse=True):
+                lines.append(f"    {name:<12} {stats['calls']:>10} вызовов {stats['time']:>10.4f} с")
+        if data['instances']:
+            lines.append("  созданные экземпляры по классам:")
+            for name, count in sorted(data['instances'].items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"    {name:<12} {count:>10}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, target):
+        """Writes the exit report: text to stderr for '1' or 'stderr', otherwise JSON to the file at target."""
+        if target in ('1', 'stderr'):
+            sys.stderr.write(self.format_report())
+            sys.stderr.flush()
+            return
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+
+def tag_native_module(names, module_name, members):
+    """
+    Records (module, name) for the functions of an imported native module in the names side table,
+    keyed by the function object, so native calls can be attributed to the module. The functions
+    themselves are shared by all interpreters and are not modified.
+    """
+    for name, member in members.items():
+        try:
+            names[member] = (module_name, name)
+        except TypeError:
+            pass
+
+
+METRICS = RuntimeMetrics()
+
+if os.environ.get(METRICS_ENV):
+    atexit.register(lambda: METRICS.write_report(os.environ[METRICS_ENV]))
@@ -0,0 +1,37 @@
+def with_caller(func):
+    """
+    Помечает нативную функцию, которой нужно вызывать функции Dark (колбэки).
+    При импорте модуля интерпретатор привязывает такую функцию так, что она
+    получает вторым аргументом call_function(fn, args).
+    """
+    func.needs_caller = True
+    return func
+
+
+def with_interpreter(func):
+    """
+    Помечает нативную функцию, которой нужен сам экземпляр Interpreter (например,
+    для регистрации обработчиков трассировки). При импорте модуля такая функция
+    привязывается так, что получает вторым аргументом interpreter.
+    """
+    func.needs_interpreter = True
+    return func
+
+
+def bind_native_module(module, call_function, interpreter=None):
+    """
+    Возвращает копию словаря модуля, в которой функции, помеченные with_caller или
+    with_interpreter, привязаны к интерпретатору. Копия возвращается всегда, чтобы
+    изменения модуля в одном интерпретаторе не попадали в общий NATIVE_MODULES.
+    """
+    if not any(getattr(member, 'needs_caller', False) or getattr(member, 'needs_interpreter', False) for member in module.values()):
+        return dict(module)
+    bound = {}
+    for name, member in module.items():
+        if getattr(member, 'needs_caller', False):
+            bound[name] = lambda args, member=member: member(args, call_function)
+        elif getattr(member, 'needs_interpreter', False):
+            bound[name] = lambda args, member=member: member(args, interpreter)
+        else:
+            bound[name] = member
+    return bound
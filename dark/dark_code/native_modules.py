@@ -8,6 +8,15 @@ from dark_code.dark_extensions.dark_stdlib import *
 from dark_code.dark_extensions.dark_time import *
 from dark_code.dark_extensions.dark_vsp210 import *
 from dark_code.dark_extensions.dark_file import *
+from dark_code.dark_extensions.dark_vec import *
+from dark_code.dark_extensions.dark_bytes import *
+from dark_code.dark_extensions.dark_process import *
+from dark_code.dark_extensions.dark_parallel import *
+from dark_code.dark_extensions.dark_tasks import *
+from dark_code.dark_extensions.dark_threads import *
+from dark_code.dark_extensions.dark_runtime import *
+from dark_code.dark_extensions.dark_debug import *
+from dark_code.dark_extensions.dark_test import *
 
 
 def native_python_exec(args, env):
@@ -46,7 +55,9 @@ NATIVE_MODULES = {
         'getsize': native_os_getsize,
         'isdir': native_os_isdir,
         'exit': lambda args: sys.exit(),
-        'system': native_os_system
+        'system': native_os_system,
+        'scan': native_os_scan,
+        'walk': native_os_walk,
     },
     'math': {
         'sqrt': native_math_sqrt,
@@ -59,6 +70,11 @@ NATIVE_MODULES = {
     },
     'stdlib': {
         'range': native_stdlib_range,
+        'irange': native_stdlib_irange,
+        'list': native_stdlib_list,
+        'set': native_stdlib_set,
+        'deque': native_stdlib_deque,
+        'heap': native_stdlib_heap,
         'list_contains': native_stdlib_list_contains,
         'list_join': native_stdlib_list_join,
         'dict_get': native_stdlib_dict_get,
@@ -69,9 +85,97 @@ NATIVE_MODULES = {
         'str_lower': native_stdlib_str_lower,
         'str_replace': native_stdlib_str_replace,
     },
+    'vec': {
+        'new': native_vec_new,
+        'from_list': native_vec_from_list,
+        'to_list': native_vec_to_list,
+        'len': native_vec_len,
+        'slice': native_vec_slice,
+        'copy': native_vec_copy,
+        'sum': native_vec_sum,
+        'mean': native_vec_mean,
+        'min': native_vec_min,
+        'max': native_vec_max,
+        'dot': native_vec_dot,
+    },
+    'bytes': {
+        'from_str': native_bytes_from_str,
+        'from_list': native_bytes_from_list,
+        'to_str': native_bytes_to_str,
+        'len': native_bytes_len,
+    },
+    'process': {
+        'run': native_process_run,
+        'spawn': native_process_spawn,
+        'poll': native_process_poll,
+        'wait': native_process_wait,
+        'kill': native_process_kill,
+        'pid': native_process_pid,
+        'run_many': native_process_run_many,
+    },
+    'parallel': {
+        'map': native_parallel_map,
+        'starmap': native_parallel_starmap,
+        'workers': native_parallel_workers,
+    },
+    'tasks': {
+        'spawn': native_tasks_spawn,
+        'gather': native_tasks_gather,
+        'sleep': native_tasks_sleep,
+        'done': native_tasks_done,
+    },
+    'threads': {
+        'start': native_threads_start,
+        'join': native_threads_join,
+        'channel': native_threads_channel,
+        'send': native_threads_send,
+        'recv': native_threads_recv,
+        'close': native_threads_close,
+    },
+    'debug': {
+        'on_call': native_debug_on_call,
+        'on_return': native_debug_on_return,
+        'on_line': native_debug_on_line,
+        'on_exception': native_debug_on_exception,
+        'on_native_call': native_debug_on_native_call,
+        'clear': native_debug_clear,
+    },
+    'test': {
+        'assert_true': native_test_assert_true,
+        'assert_equal': native_test_assert_equal,
+        'fail': native_test_fail,
+    },
+    'runtime': {
+        'metrics': native_runtime_metrics,
+        'reset': native_runtime_reset,
+        'report': native_runtime_report,
+    },
     'http': {
         'get': native_http_get,
         'post': native_http_post,
+        'put': native_http_put,
+        'delete': native_http_delete,
+        'request': native_http_request,
+        'configure': native_http_configure,
+        'close': native_http_close,
+        'cache_enable': native_http_cache_enable,
+        'cache_disable': native_http_cache_disable,
+        'cache_clear': native_http_cache_clear,
+        'cache_stats': native_http_cache_stats,
+        'serve': native_http_serve,
+        'serve_background': native_http_serve_background,
+        'server_port': native_http_server_port,
+        'server_stats': native_http_server_stats,
+        'server_stop': native_http_server_stop,
+        'get_async': native_http_get_async,
+        'post_async': native_http_post_async,
+        'request_async': native_http_request_async,
+        'download_async': native_http_download_async,
+        'get_many': native_http_get_many,
+        'request_many': native_http_request_many,
+        'iter_many': native_http_iter_many,
+        'download': native_http_download,
+        'stream': native_http_stream,
     },
     'time': {
         'time': native_time_time,
@@ -93,6 +197,15 @@ NATIVE_MODULES = {
         'readline': native_file_readline,
         'readlines': native_file_readlines,
         'seek': native_file_seek,
+        'read_chunk': native_file_read_chunk,
+        'chunks': native_file_chunks,
+        'write_lines': native_file_write_lines,
+        'mmap': native_file_mmap,
+        'copy': native_file_copy,
+        'concat': native_file_concat,
+        'append_file': native_file_append_file,
+        'read_async': native_file_read_async,
+        'write_async': native_file_write_async,
     },
     'gui': {
         'create_window': native_gui_create_window, 'create_label': native_gui_create_label,
@@ -78,27 +78,10 @@ class Parser:
             if self.cur().type == 'SEMI': self.eat('SEMI')
             return ('import', module_name, line)
         if tok.type == 'FUNCTION':
-            self.eat('FUNCTION')
-            name = self.eat('ID').value
-            line = self.cur().line
-            self.eat('LPAR')
-            params = []
-            if self.cur().type != 'RPAR':
-                params.append(self.eat('ID').value)
-                while self.cur().type == 'COMMA':
-                    self.eat('COMMA')
-                    params.append(self.eat('ID').value)
-            self.eat('RPAR')
-            while self.cur().type == 'SEMI':
-                self.eat('SEMI')
-            self.eat('DO')
-            body = []
-            while self.cur().type not in ('END', 'EOF'):
-                if self.cur().type == 'SEMI': self.eat('SEMI'); continue
-                body.append(self.stmt())
-            self.eat('END')
-            if self.cur().type == 'SEMI': self.eat('SEMI')
-            return ('func_def', name, params, body, line)
+            return self.function_def('func_def')
+        if tok.type == 'ASYNC':
+            self.eat('ASYNC')
+            return self.function_def('async_func_def')
         if tok.type == 'RETURN':
             self.eat('RETURN')
             val_expr = None
@@ -231,13 +214,51 @@ class Parser:
         methods = []
         while self.cur().type not in ('END', 'EOF'):
             if self.cur().type == 'SEMI': self.eat('SEMI'); continue
-            if self.cur().type != 'FUNCTION':
+            if self.cur().type not in ('FUNCTION', 'ASYNC'):
                 raise DarkSyntaxError(f"Only function definitions are allowed inside a class body.", line=self.cur().line, col=self.cur().col)
             methods.append(self.stmt())
         self.eat('END')
         if self.cur().type == 'SEMI': self.eat('SEMI')
         return ('class_def', name, base_class_name, methods, line)
 
+    def function_def(self, kind):
+        """Разбирает определение функции после необязательного 'async'; kind - 'func_def' или 'async_func_def'."""
+        self.eat('FUNCTION')
+        name = self.eat('ID').value
+        line = self.cur().line
+        self.eat('LPAR')
+        params = []
+        if self.cur().type != 'RPAR':
+            params.append(self.eat('ID').value)
+            while self.cur().type == 'COMMA':
+                self.eat('COMMA')
+                params.append(self.eat('ID').value)
+        self.eat('RPAR')
+        while self.cur().type == 'SEMI':
+            self.eat('SEMI')
+        self.eat('DO')
+        body = []
+        while self.cur().type not in ('END', 'EOF'):
+            if self.cur().type == 'SEMI': self.eat('SEMI'); continue
+            body.append(self.stmt())
+        self.eat('END')
+        if self.cur().type == 'SEMI': self.eat('SEMI')
+        return (kind, name, params, body, line)
+
+    def set_literal(self, first_elem):
+        """Разбирает литерал множества {a, b, c} после уже прочитанного первого элемента."""
+        elements = [first_elem]
+        while self.cur().type == 'COMMA':
+            self.eat('COMMA')
+            while self.cur().type == 'SEMI': self.eat('SEMI')
+            if self.cur().type == 'RBRACE': break
+            elements.append(self.expr())
+
+        while self.cur().type == 'SEMI': self.eat('SEMI')
+
+        self.eat('RBRACE')
+        return ('set', elements)
+
     def expr(self):
         node = self.and_expr()
         while self.cur().type == 'OR':
@@ -323,6 +344,11 @@ class Parser:
             node = self.factor()
             return ('unary', 'not', node, op_tok.line)
 
+        if tok.type == 'AWAIT':
+            await_tok = self.eat('AWAIT')
+            node = self.primary()
+            return ('await', node, await_tok.line)
+
         if tok.type == 'STRING':
             self.eat('STRING')
             return ('str', tok.value)
@@ -357,7 +383,10 @@ class Parser:
             while self.cur().type == 'SEMI': self.eat('SEMI')
 
             if self.cur().type != 'RBRACE':
-                key = self.expr(); self.eat('COLON'); value = self.expr()
+                key = self.expr()
+                if self.cur().type != 'COLON':
+                    return self.set_literal(key)
+                self.eat('COLON'); value = self.expr()
                 pairs.append((key, value))
                 while self.cur().type == 'COMMA':
                     self.eat('COMMA')
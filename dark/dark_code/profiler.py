@@ -0,0 +1,212 @@
+import json
+import marshal
+import sys
+import threading
+import time
+
+
+class FunctionStats:
+    """Счётчики одной функции Dark: вызовы, собственное и полное время, статистика по вызывающим."""
+    __slots__ = ('calls', 'primitive_calls', 'self_time', 'total_time', 'callers')
+
+    def __init__(self):
+        self.calls = 0
+        self.primitive_calls = 0
+        self.self_time = 0.0
+        self.total_time = 0.0
+        self.callers = {}
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.primitive_calls += other.primitive_calls
+        self.self_time += other.self_time
+        self.total_time += other.total_time
+        for caller, edge in other.callers.items():
+            mine = self.callers.setdefault(caller, [0, 0, 0.0, 0.0])
+            for i, value in enumerate(edge):
+                mine[i] += value
+
+
+class _ThreadState:
+    def __init__(self):
+        self.functions = {}
+        self.lines = {}
+        self.call_stack = []
+        self.line_stack = []
+        self.active = {}
+
+
+class Profiler:
+    """
+    Детерминированный профилировщик: замеряет каждый вызов функции Dark и каждую
+    выполненную инструкцию. Interpreter(profiler=...) подменяет run_function_body и
+    run_stmt обёртками из wrap_call()/wrap_stmt(); без профилировщика исполнитель не меняется.
+    Собственное время функции и строки не включает время вложенных вызовов и инструкций,
+    полное время рекурсивной функции учитывается только для внешнего вызова.
+    Время настенное: ожидание в await и блокирующих вызовах входит во время функции.
+    """
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.states = []
+        self.started = None
+        self.elapsed = 0.0
+
+    def _state(self):
+        state = getattr(self.local, 'state', None)
+        if state is None:
+            state = self.local.state = _ThreadState()
+            with self.lock:
+                self.states.append(state)
+        return state
+
+    def start(self):
+        self.started = self.clock()
+
+    def stop(self):
+        if self.started is not None:
+            self.elapsed += self.clock() - self.started
+            self.started = None
+
+    def wrap_call(self, run_function_body):
+        """Returns run_function_body instrumented with call counts and inclusive/exclusive time."""
+        clock = self.clock
+
+        def profiled_function_body(func, args, call_site_line, self_instance):
+            state = self._state()
+            key = (func.definition_env.get('__file__', '<main>'), func.line or 0, func.name)
+            stack = state.call_stack
+            caller = stack[-1][0] if stack else None
+            frame = [key, 0.0]
+            stack.append(frame)
+            active = state.active
+            active[key] = active.get(key, 0) + 1
+            started = clock()
+            try:
+                return run_function_body(func, args, call_site_line, self_instance)
+            finally:
+                elapsed = clock() - started
+                stack.pop()
+                if stack:
+                    stack[-1][1] += elapsed
+                depth = active[key] - 1
+                active[key] = depth
+                stats = state.functions.get(key)
+                if stats is None:
+                    stats = state.functions[key] = FunctionStats()
+                own = elapsed - frame[1]
+                outermost = depth == 0
+                stats.calls += 1
+                stats.self_time += own
+                if outermost:
+                    stats.primitive_calls += 1
+                    stats.total_time += elapsed
+                if caller is not None:
+                    edge = stats.callers.get(caller)
+                    if edge is None:
+                        edge = stats.callers[caller] = [0, 0, 0.0, 0.0]
+                    edge[0] += 1
+                    edge[2] += own
+                    if outermost:
+                        edge[1] += 1
+                        edge[3] += elapsed
+
+        return profiled_function_body
+
+    def wrap_stmt(self, run_stmt):
+        """Returns run_stmt instrumented with hit counts and exclusive time per source line."""
+        clock = self.clock
+
+        def profiled_stmt(s, current_env):
+            state = self._state()
+            stack = state.line_stack
+            stack.append(0.0)
+            started = clock()
+            try:
+                return run_stmt(s, current_env)
+            finally:
+                elapsed = clock() - started
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                key = (current_env.get('__file__', '<main>'), s[-1])
+                stats = state.lines.get(key)
+                if stats is None:
+                    stats = state.lines[key] = [0, 0.0]
+                stats[0] += 1
+                stats[1] += elapsed - nested
+
+        return profiled_stmt
+
+    def collect(self):
+        """Merges the per-thread counters; returns (functions, lines) dictionaries."""
+        functions, lines = {}, {}
+        with self.lock:
+            states = list(self.states)
+        for state in states:
+            for key, stats in list(state.functions.items()):
+                functions.setdefault(key, FunctionStats()).merge(stats)
+            for key, (hits, spent) in list(state.lines.items()):
+                merged = lines.setdefault(key, [0, 0.0])
+                merged[0] += hits
+                merged[1] += spent
+        return functions, lines
+
+    def print_report(self, out=None, limit=20):
+        """Prints the functions and the lines sorted by exclusive time."""
+        out = out or sys.stderr
+        functions, lines = self.collect()
+        total_calls = sum(stats.calls for stats in functions.values())
+        out.write(f"\nПрофиль выполнения: {total_calls} вызовов функций за {self.elapsed:.3f} с\n\n")
+        out.write(f"{'вызовы':>10} {'всего, с':>10} {'собств., с':>11} {'мс/вызов':>9}  функция\n")
+        ranked = sorted(functions.items(), key=lambda item: item[1].self_time, reverse=True)
+        for (file_name, line, name), stats in ranked[:limit]:
+            calls = str(stats.calls) if stats.calls == stats.primitive_calls else f"{stats.calls}/{stats.primitive_calls}"
+            per_call = stats.self_time / stats.calls * 1000 if stats.calls else 0.0
+            out.write(f"{calls:>10} {stats.total_time:>10.4f} {stats.self_time:>11.4f} {per_call:>9.4f}  {name} ({file_name}:{line})\n")
+        out.write(f"\n{'выполнения':>10} {'собств., с':>11}  строка\n")
+        ranked_lines = sorted(lines.items(), key=lambda item: item[1][1], reverse=True)
+        for (file_name, line), (hits, spent) in ranked_lines[:limit]:
+            out.write(f"{hits:>10} {spent:>11.4f}  {file_name}:{line}\n")
+        out.flush()
+
+    def to_json(self):
+        functions, lines = self.collect()
+        return {
+            'elapsed': self.elapsed,
+            'functions': [
+                {
+                    'file': file_name, 'line': line, 'name': name,
+                    'calls': stats.calls, 'primitive_calls': stats.primitive_calls,
+                    'self_time': stats.self_time, 'total_time': stats.total_time,
+                    'callers': [
+                        {'file': caller[0], 'line': caller[1], 'name': caller[2], 'calls': edge[0], 'self_time': edge[2], 'total_time': edge[3]}
+                        for caller, edge in stats.callers.items()
+                    ],
+                }
+                for (file_name, line, name), stats in sorted(functions.items(), key=lambda item: item[1].self_time, reverse=True)
+            ],
+            'lines': [
+                {'file': file_name, 'line': line, 'hits': hits, 'self_time': spent}
+                for (file_name, line), (hits, spent) in sorted(lines.items())
+            ],
+        }
+
+    def to_pstats(self):
+        """Returns the function statistics in the dictionary format that pstats.Stats loads from a file."""
+        functions, _ = self.collect()
+        stats = {}
+        for key, entry in functions.items():
+            callers = {caller: (edge[0], edge[1], edge[2], edge[3]) for caller, edge in entry.callers.items()}
+            stats[key] = (entry.primitive_calls, entry.calls, entry.self_time, entry.total_time, callers)
+        return stats
+
+    def save(self, path):
+        """Writes the profile as JSON (for a .json path) or as a pstats file (for any other path)."""
+        if path.endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_json(), f, ensure_ascii=False, indent=2)
+        else:
+            with open(path, 'wb') as f:
+                marshal.dump(self.to_pstats(), f)
@@ -0,0 +1,126 @@
+import sys
+import threading
+import time
+import types
+from dark_code.interpreter import _make_runtime
+
+SAMPLE_INTERVAL = 0.01
+
+
+def _runtime_codes(code, found):
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            found.setdefault(const.co_name, const)
+            _runtime_codes(const, found)
+    return found
+
+_CODES = _runtime_codes(_make_runtime.__code__, {})
+_STMT_CODE = _CODES['run_stmt']
+_FUNCTION_CODES = (_CODES['run_function_body'], _CODES['fast_call'])
+_MODULE_CODE = _CODES['execute_ast']
+
+
+def dark_stack(frame):
+    """
+    Восстанавливает стек вызовов Dark по стеку Python-фреймов исполнителя:
+    фреймы run_function_body/fast_call дают функции, execute_ast - модули,
+    а ближайший вложенный run_stmt - текущую строку в каждой из них.
+    Возвращает кортежи (file, line, name), как в DarkError.add_trace, от внешнего к внутреннему.
+    """
+    stack = []
+    line = None
+    while frame is not None:
+        code = frame.f_code
+        if code is _STMT_CODE:
+            if line is None:
+                line = frame.f_locals['s'][-1]
+        elif code in _FUNCTION_CODES:
+            func = frame.f_locals['func']
+            stack.append((func.definition_env.get('__file__', '<main>'), line or func.line or 0, func.name))
+            line = None
+        elif code is _MODULE_CODE:
+            env = frame.f_locals['env']
+            stack.append((env.get('__file__', '<main>'), line or 0, '<module>'))
+            line = None
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class SamplingProfiler:
+    """
+    Статистический профилировщик: фоновый поток каждые interval секунд снимает
+    стек Dark всех потоков через sys._current_frames(). Исполнитель при этом не
+    инструментируется, поэтому затраты ограничены самим снятием выборок и не искажают
+    короткие горячие функции. Выборки настенные: ожидающие потоки тоже учитываются.
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        if interval <= 0:
+            raise ValueError("sampling interval must be positive")
+        self.interval = interval
+        self.counts = {}
+        self.samples = 0
+        self.elapsed = 0.0
+        self.thread = None
+        self.stopping = threading.Event()
+        self.started = None
+
+    def start(self):
+        self.stopping.clear()
+        self.started = time.perf_counter()
+        self.thread = threading.Thread(target=self._run, daemon=True, name='dark-sampler')
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+        self.elapsed += time.perf_counter() - self.started
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self.stopping.wait(self.interval):
+            self.sample(skip=own)
+
+    def sample(self, skip=None):
+        """Records the current Dark stack of every thread except skip."""
+        counts = self.counts
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            stack = dark_stack(frame)
+            if stack:
+                counts[stack] = counts.get(stack, 0) + 1
+        self.samples += 1
+
+    def collapsed(self):
+        """Returns the samples in collapsed-stack format (`frame;frame;frame count`) for flamegraph tools."""
+        lines = []
+        for stack, count in sorted(self.counts.items()):
+            frames = ";".join(f"{name} ({file_name}:{line})" for file_name, line, name in stack)
+            lines.append(f"{frames} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
+
+    def print_report(self, out=None, limit=20):
+        """Prints the functions with the most samples on top of the stack and anywhere in it."""
+        out = out or sys.stderr
+        own, inclusive = {}, {}
+        total = 0
+        for stack, count in self.counts.items():
+            total += count
+            file_name, _, name = stack[-1]
+            own[(file_name, name)] = own.get((file_name, name), 0) + count
+            for key in {(frame_file, frame_name) for frame_file, _, frame_name in stack}:
+                inclusive[key] = inclusive.get(key, 0) + count
+        out.write(f"\nВыборочный профиль: {total} выборок стека за {self.elapsed:.3f} с (интервал {self.interval * 1000:g} мс)\n\n")
+        out.write(f"{'собств.':>9} {'%':>6} {'всего':>9} {'%':>6}  функция\n")
+        for key, count in sorted(own.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            file_name, name = key
+            out.write(f"{count:>9} {count / total * 100:>6.1f} {inclusive[key]:>9} {inclusive[key] / total * 100:>6.1f}  {name} ({file_name})\n")
+        out.flush()
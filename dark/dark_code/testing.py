@@ -0,0 +1,268 @@
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing.connection import wait as wait_connections
+from dark_code.dark_exceptions import DarkError
+from dark_code.lexer import lex
+from dark_code.parser import Parser
+
+TEST_TIMEOUT = 60.0
+SLOWEST_TESTS = 10
+STATUS_MARKS = {'passed': '.', 'failed': 'F', 'timeout': 'T', 'crashed': 'C'}
+
+_WORKER_STATE = {}
+
+
+def discover(path):
+    """Returns ([(file, [test function names])], [(file, error)]) for test_*.dark files under path, or for path itself."""
+    if os.path.isfile(path):
+        files = [os.path.abspath(path)]
+    else:
+        files = []
+        for directory, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d != '__darkcache__')
+            files.extend(os.path.abspath(os.path.join(directory, name)) for name in sorted(names)
+                         if name.startswith('test_') and name.endswith('.dark'))
+    found, errors = [], []
+    for file_name in files:
+        try:
+            with open(file_name, 'r', encoding='utf-8') as f:
+                parser = Parser(lex(f.read()))
+            ast = parser.parse()
+        except (OSError, UnicodeDecodeError) as e:
+            errors.append((file_name, str(e)))
+            continue
+        if parser.errors:
+            error = parser.errors[0]
+            errors.append((file_name, f"синтаксическая ошибка в строке {error.line}: {error.message}"))
+            continue
+        names = [stmt[1] for stmt in ast[1]
+                 if stmt[0] in ('func_def', 'async_func_def') and stmt[1].startswith('test_')]
+        if names:
+            found.append((file_name, names))
+    return found, errors
+
+
+def _describe_error(e):
+    lines = [f"{type(e).__name__.replace('Dark', '')}: {e.message}" + (f" (строка {e.line})" if e.line else "")]
+    for file_name, line, context in e.traceback:
+        location = f"{file_name}:{line}" if line else file_name
+        lines.append(f"  {location} в {context}")
+    return "\n".join(lines)
+
+
+def _worker_interpreter(file_name):
+    # Each test file gets its own interpreter, so module state imported or changed by one
+    # file never leaks into another; tests of the same file share it and its imports.
+    from dark_code.interpreter import Interpreter
+    if _WORKER_STATE.get('file') != file_name:
+        _WORKER_STATE['file'] = file_name
+        _WORKER_STATE['interpreter'] = Interpreter()
+    return _WORKER_STATE['interpreter']
+
+
+def run_test(file_name, test_name):
+    """Runs one test in a fresh environment of its file; returns a result dict with status, duration, message and output."""
+    from dark_code.dark_extensions.dark_tasks import await_value
+    script_dir = os.path.dirname(file_name)
+    interpreter = _worker_interpreter(file_name)
+    output = io.StringIO()
+    status, message = 'passed', ''
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            with open(file_name, 'r', encoding='utf-8') as f:
+                program = interpreter.compile(f.read(), file_name, script_dir)
+            env = program.execute({'__file__': file_name})
+            await_value(interpreter.call_value(env[test_name], []))
+    except DarkError as e:
+        status, message = 'failed', _describe_error(e)
+    except Exception as e:
+        status, message = 'failed', f"{type(e).__name__}: {e}"
+    return {
+        'file': file_name, 'name': test_name, 'status': status,
+        'duration': time.perf_counter() - started, 'message': message, 'output': output.getvalue(),
+    }
+
+
+def _worker_main(conn):
+    # Importing the interpreter loads every native module once per worker.
+    import dark_code.interpreter
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        conn.send(run_test(*task))
+
+
+class _Worker:
+    """Рабочий процесс с загруженным интерпретатором, выполняющий по одному тесту за раз."""
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None
+        self.deadline = None
+
+    def submit(self, task, timeout):
+        self.task = task
+        self.deadline = time.monotonic() + timeout
+        self.conn.send(task)
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def _failure(task, status, duration, message):
+    return {'file': task[0], 'name': task[1], 'status': status, 'duration': duration, 'message': message, 'output': ''}
+
+
+def run_tests(tasks, workers, timeout=TEST_TIMEOUT, on_result=None):
+    """
+    Выполняет тесты (file, name) в пуле рабочих процессов. Тест, превысивший timeout,
+    и упавший процесс не влияют на остальные: процесс завершается и заменяется новым.
+    Возвращает список результатов в порядке завершения.
+    """
+    context = multiprocessing.get_context()
+    pending = deque(tasks)
+    results = []
+    pool = [_Worker(context) for _ in range(max(1, min(workers, len(pending))))]
+
+    def finish(worker, result):
+        worker.task = None
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    def dispatch(worker):
+        if pending:
+            worker.submit(pending.popleft(), timeout)
+
+    try:
+        for worker in pool:
+            dispatch(worker)
+        while True:
+            busy = [worker for worker in pool if worker.task is not None]
+            if not busy:
+                break
+            wait_for = max(0.0, min(worker.deadline for worker in busy) - time.monotonic())
+            ready = wait_connections([worker.conn for worker in busy], wait_for)
+            for index, worker in enumerate(pool):
+                if worker.task is None:
+                    continue
+                if worker.conn in ready:
+                    try:
+                        result = worker.conn.recv()
+                    except (EOFError, OSError):
+                        task = worker.task
+                        worker.kill()
+                        result = _failure(task, 'crashed', 0.0, f"рабочий процесс аварийно завершился (код {worker.process.exitcode})")
+                        pool[index] = worker = _Worker(context)
+                    finish(worker, result)
+                    dispatch(worker)
+                elif time.monotonic() >= worker.deadline:
+                    task = worker.task
+                    worker.kill()
+                    pool[index] = worker = _Worker(context)
+                    finish(worker, _failure(task, 'timeout', timeout, f"тест не завершился за {timeout:g} с"))
+                    dispatch(worker)
+    finally:
+        for worker in pool:
+            worker.close()
+    return results
+
+
+def _display_name(result):
+    return f"{os.path.relpath(result['file'])}::{result['name']}"
+
+
+def print_report(results, collection_errors, elapsed, workers, out=None):
+    out = out or sys.stdout
+    problems = [result for result in results if result['status'] != 'passed']
+    if problems or collection_errors:
+        out.write("\n\nОшибки:\n")
+    for file_name, message in collection_errors:
+        out.write(f"\n--- {os.path.relpath(file_name)}: не удалось загрузить\n{message}\n")
+    for result in sorted(problems, key=lambda item: (item['file'], item['name'])):
+        out.write(f"\n--- {_display_name(result)} [{result['status']}] ({result['duration']:.3f} с)\n{result['message']}\n")
+        if result['output']:
+            out.write(f"вывод теста:\n{result['output']}")
+            if not result['output'].endswith("\n"):
+                out.write("\n")
+    slowest = sorted(results, key=lambda item: item['duration'], reverse=True)[:SLOWEST_TESTS]
+    if slowest:
+        out.write("\nСамые медленные тесты:\n")
+        for result in slowest:
+            out.write(f"  {result['duration']:>8.3f} с  {_display_name(result)}\n")
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    summary = [f"{counts.get('passed', 0)} пройдено"]
+    for status, label in (('failed', 'провалено'), ('timeout', 'превысили время'), ('crashed', 'аварийно завершились')):
+        if counts.get(status):
+            summary.append(f"{counts[status]} {label}")
+    if collection_errors:
+        summary.append(f"{len(collection_errors)} файлов с ошибками")
+    total_time = sum(result['duration'] for result in results)
+    out.write(f"\nИтог: {', '.join(summary)} за {elapsed:.2f} с ({workers} процессов, суммарное время тестов {total_time:.2f} с)\n")
+    out.flush()
+
+
+def main(argv):
+    """Entry point of `dark --test [path] [--workers N] [--timeout SECONDS]`; returns the process exit code."""
+    path, workers, timeout = '.', os.cpu_count() or 1, TEST_TIMEOUT
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        try:
+            if arg == '--workers':
+                workers = int(args.pop(0))
+            elif arg == '--timeout':
+                timeout = float(args.pop(0))
+            else:
+                path = arg
+        except (IndexError, ValueError):
+            print(f"Ошибка: флагу {arg} нужно числовое значение", file=sys.stderr)
+            return 2
+    if workers < 1 or timeout <= 0:
+        print("Ошибка: --workers и --timeout должны быть положительными", file=sys.stderr)
+        return 2
+    if not os.path.exists(path):
+        print(f"Ошибка: путь не найден: {os.path.abspath(path)}", file=sys.stderr)
+        return 2
+
+    found, collection_errors = discover(path)
+    tasks = [(file_name, name) for file_name, names in found for name in names]
+    workers = max(1, min(workers, len(tasks)))
+    print(f"Найдено тестов: {len(tasks)} в {len(found)} файлах, процессов: {workers}")
+    started = time.perf_counter()
+
+    def progress(result):
+        sys.stdout.write(STATUS_MARKS[result['status']])
+        sys.stdout.flush()
+
+    results = run_tests(tasks, workers, timeout, progress) if tasks else []
+    print_report(results, collection_errors, time.perf_counter() - started, workers)
+    failed = collection_errors or any(result['status'] != 'passed' for result in results)
+    return 1 if failed else 0
@@ -20,7 +20,9 @@ try:
 except ImportError:
     pass
 
-from dark_code.dark_lang import Parser, lex, run, DarkRuntimeError, StaticAnalyzer
+from dark_code.dark_lang import Parser, lex, run, DarkRuntimeError, StaticAnalyzer, Profiler, SamplingProfiler
+from dark_code.metrics import METRICS
+from dark_code import coverage, testing
 
 FROZEN_SCRIPT_CONTENT = None
 
@@ -121,7 +123,7 @@ def check_script(file_name):
         print(f"Неожиданная ошибка анализа в файле {os.path.abspath(file_name)}:1:1: {e}", file=sys.stderr)
         sys.exit(1)
 
-def execute_dark_code(code, source_name, use_cache=True):
+def execute_dark_code(code, source_name, use_cache=True, profiler=None, hooks=None):
     """
     Выполняет код Dark из строки, управляя кэшированием и ошибками.
     """
@@ -152,10 +154,13 @@ def execute_dark_code(code, source_name, use_cache=True):
             try:
                 with open(cache_file_path, 'rb') as f:
                     ast = pickle.load(f)
+                METRICS.compile_hits += 1
             except Exception:
                 ast = None
 
     if ast is None:
+        if not nocache and is_real_file:
+            METRICS.compile_misses += 1
         tokens = lex(code)
         parser = Parser(tokens)
         ast = parser.parse()
@@ -175,16 +180,16 @@ def execute_dark_code(code, source_name, use_cache=True):
 
     script_dir = os.path.dirname(os.path.abspath(source_name)) if is_real_file else '.'
     
-    run(ast, source_name=source_name, script_dir=script_dir, use_with_python=USE_WITH_PYTHON, use_tkinter=USE_TKINTER)
+    run(ast, source_name=source_name, script_dir=script_dir, use_with_python=USE_WITH_PYTHON, use_tkinter=USE_TKINTER, profiler=profiler, hooks=hooks)
 
-def run_script(file_name):
+def run_script(file_name, profiler=None, hooks=None):
     """
     Читает файл и запускает его выполнение.
     """
     try:
         with open(file_name, 'r', encoding='utf-8') as f:
             code = f.read()
-        execute_dark_code(code, file_name, use_cache=True)
+        execute_dark_code(code, file_name, use_cache=True, profiler=profiler, hooks=hooks)
     except FileNotFoundError as e:
         print(f"Ошибка выполнения: Файл '{file_name}' не найден.")
     except KeyboardInterrupt:
@@ -195,6 +200,58 @@ def run_script(file_name):
         e.filename = os.path.abspath(file_name)
         print(e)
 
+def profile_script(file_name, output_path=None):
+    """
+    Запускает скрипт под детерминированным профилировщиком и выводит в stderr
+    таблицы функций и строк по собственному времени. Если указан output_path,
+    сохраняет профиль: JSON для файла .json, иначе файл pstats.
+    """
+    profiler = Profiler()
+    profiler.start()
+    try:
+        run_script(file_name, profiler=profiler)
+    finally:
+        profiler.stop()
+        profiler.print_report(sys.stderr)
+        if output_path:
+            profiler.save(output_path)
+            print(f"Профиль сохранён в {os.path.abspath(output_path)}", file=sys.stderr)
+
+def sample_script(file_name, output_path=None):
+    """
+    Запускает скрипт под выборочным профилировщиком, выводит в stderr самые частые
+    функции и сохраняет стеки в формате collapsed для flamegraph
+    (по умолчанию в файл <имя скрипта>.folded рядом со скриптом).
+    """
+    if not output_path:
+        output_path = os.path.splitext(file_name)[0] + '.folded'
+    sampler = SamplingProfiler()
+    sampler.start()
+    try:
+        run_script(file_name)
+    finally:
+        sampler.stop()
+        sampler.print_report(sys.stderr)
+        sampler.save(output_path)
+        print(f"Стеки для flamegraph сохранены в {os.path.abspath(output_path)}", file=sys.stderr)
+
+def coverage_script(file_name, lcov_path):
+    """
+    Запускает скрипт со сбором покрытия строк, сохраняет фрагмент данных в каталог
+    .darkcoverage (или DARK_COVERAGE_DIR) и строит по всем накопленным фрагментам
+    отчёт lcov и сводку в stderr. `dark --coverage-erase` очищает накопленные данные.
+    """
+    collector = coverage.Coverage()
+    try:
+        run_script(file_name, hooks=collector.hooks())
+    finally:
+        data_dir = coverage.coverage_dir()
+        collector.save_fragment(data_dir)
+        results = coverage.analyze(coverage.load_fragments(data_dir))
+        coverage.write_lcov(results, lcov_path)
+        coverage.print_summary(results, sys.stderr)
+        print(f"Отчёт lcov сохранён в {os.path.abspath(lcov_path)}", file=sys.stderr)
+
 
 def main():
     """
@@ -214,6 +271,9 @@ def main():
             print(f"Ошибка: Не указан файл для запуска или проверки({os.path.exists(default_script)}).", file=sys.stderr)
             sys.exit(1)
 
+    if sys.argv[1] == '--test':
+        sys.exit(testing.main(sys.argv[2:]))
+
     mode = 'run'
     file_arg_index = 1
 
@@ -224,6 +284,18 @@ def main():
         elif sys.argv[1] == '--parser':
             mode = 'parser'
             file_arg_index = 2
+        elif sys.argv[1] == '--profile':
+            mode = 'profile'
+            file_arg_index = 2
+        elif sys.argv[1] == '--sample':
+            mode = 'sample'
+            file_arg_index = 2
+        elif sys.argv[1] == '--coverage':
+            mode = 'coverage'
+            file_arg_index = 2
+        elif sys.argv[1] == '--coverage-erase':
+            coverage.erase(coverage.coverage_dir())
+            sys.exit(0)
 
         else:
             print(f"Неизвестный флаг: {sys.argv[1]}", file=sys.stderr)
@@ -258,8 +330,16 @@ def main():
 
         for token in processed_tokens:
             print(token)
+    elif mode == 'profile':
+        profile_script(file_to_process, sys.argv[3] if len(sys.argv) > 3 else None)
+    elif mode == 'sample':
+        sample_script(file_to_process, sys.argv[3] if len(sys.argv) > 3 else None)
+    elif mode == 'coverage':
+        coverage_script(file_to_process, sys.argv[3] if len(sys.argv) > 3 else 'coverage.lcov')
     else:
         run_script(file_to_process)
 
 if __name__ == "__main__":
+    if 'multiprocessing' in sys.modules:
+        multiprocessing.freeze_support()
     main()
\ No newline at end of file